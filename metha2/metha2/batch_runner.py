@@ -0,0 +1,224 @@
+import argparse, glob, hashlib, json, os, time
+from multiprocessing import Pool
+
+from utils import read_instance
+from constructive import constructive_greedy_lazy
+from constructive_batch import constructive_grasp_batch, constructive_random_batch
+from local_search import local_search_best_improvement, local_search_first_improvement
+from meta_sa import simulated_annealing
+from meta_tabu import tabu_search
+from grasp_pr import grasp_path_relinking
+from budget import Budget
+from bounds import upper_bound
+from reduction import reduce_instance
+from zobrist import EvalCache
+from instrumentation import SolverStats
+from results_store import ResultsStore, record_from_solution
+
+# Rodada em lote: grade instâncias x métodos x sementes, em um pool de processos.
+# Cada célula vira um registro no ResultsStore (SQLite); células já presentes com a
+# mesma configuração (parâmetros do método + orçamento e flags, ver run_config) são
+# puladas, então uma varredura interrompida continua de onde parou, e rodar de novo
+# com outras opções roda as células de novo em vez de dá-las como feitas.
+# Com --bound cada registro leva o limitante superior e o gap (bounds.py), e os
+# solvers param assim que a solução atinge o limitante. Com --reduce os solvers rodam
+# na instância reduzida (reduction.py) e a solução volta para os índices originais.
+# Com --cache N cada célula usa um EvalCache (zobrist.py) de N entradas e grava
+# os acertos em stats.cache; só o GRASP+PR usa (é o único método que roda muitas
+# buscas locais numa célula, então um ótimo local já calculado pode ser reaproveitado).
+#
+# uso: python batch_runner.py --instances "prob-software*.txt" --methods GRASP SA_FAST --seeds 1 2 3
+
+# mesmos parâmetros usados em main.py; RANDOM e GRASP constroem em lote
+# (constructive_batch.py), batch = construções por lote
+RANDOM_PARAMS = {"restarts": 200, "batch": 64}
+GRASP_PARAMS = {"iters": 200, "rcl_size": 8, "batch": 64}
+SA_FAST_PARAMS = {"T0": 80, "alpha": 0.90, "SAmax": 120, "Tfinal": 1e-3, "max_neighbor_trials": 8}
+SA_QUALITY_PARAMS = {"T0": 120, "alpha": 0.95, "SAmax": 300, "Tfinal": 1e-3, "max_neighbor_trials": 12}
+TABU_PARAMS = {"max_iters": 2000, "tenure": None, "max_no_improve": 300}
+GRASP_PR_PARAMS = {"iters": 100, "rcl_size": 8, "elite_size": 10, "min_distance": None}
+
+METHODS = ["RANDOM", "GREEDY", "GRASP", "LOCAL_BEST", "LOCAL_FIRST",
+           "SA_FAST", "SA_QUALITY", "TABU", "GRASP+LS_FIRST", "GRASP+PR"]
+
+_INSTANCES = {}  # cache por worker: caminho -> instância
+_REDUCED = {}    # cache por worker: caminho -> (instância reduzida, Reduction)
+
+
+def _instance(path):
+    if path not in _INSTANCES:
+        _INSTANCES[path] = read_instance(path, bitset=True)
+    return _INSTANCES[path]
+
+
+def _reduced(path):
+    if path not in _REDUCED:
+        _REDUCED[path] = reduce_instance(*_instance(path))
+    return _REDUCED[path]
+
+
+def run_method(method, inst, seed, budget=None, stats=None, cache=None):
+    """
+    Roda um método e devolve (pacotes, parâmetros, tempo).
+    Como em main.py, LOCAL_*, SA_* e TABU partem da solução do GRASP e o tempo
+    registrado é só o da fase do método; GRASP+LS_FIRST soma as duas fases.
+    Com budget, o orçamento vale para a fase medida (em GRASP+LS_FIRST, as duas).
+    GRASP+PR (construções + busca local + path relinking) não usa o GRASP de partida.
+    stats (SolverStats) instrumenta a busca local, o SA, a busca tabu e o GRASP+PR;
+    cache (EvalCache) vai para as buscas locais do GRASP+PR.
+    """
+    m, n, ne, b, c, a, pkg_deps = inst
+    if method == "RANDOM":
+        start = time.time()
+        _, pkgs = constructive_random_batch(m, b, c, a, pkg_deps, seed=seed, budget=budget, **RANDOM_PARAMS)
+        return pkgs, dict(RANDOM_PARAMS), time.time() - start
+    if method == "GREEDY":
+        start = time.time()
+        _, pkgs = constructive_greedy_lazy(m, b, c, a, pkg_deps, budget=budget)
+        return pkgs, {}, time.time() - start
+    if method == "GRASP+PR":
+        start = time.time()
+        _, pkgs = grasp_path_relinking(m, b, c, a, pkg_deps, seed=seed, budget=budget, stats=stats,
+                                       cache=cache, **GRASP_PR_PARAMS)
+        return pkgs, dict(GRASP_PR_PARAMS), time.time() - start
+
+    # o GRASP de partida de LOCAL_* / SA_* / TABU fica fora do orçamento (e do tempo), como em main.py
+    grasp_budget = budget if method in ("GRASP", "GRASP+LS_FIRST") else None
+    start = time.time()
+    _, pkgs_grasp = constructive_grasp_batch(m, b, c, a, pkg_deps, seed=seed, budget=grasp_budget,
+                                             **GRASP_PARAMS)
+    t_grasp = time.time() - start
+    if method == "GRASP":
+        return pkgs_grasp, dict(GRASP_PARAMS), t_grasp
+
+    if budget is not None and grasp_budget is None:
+        budget.restart()
+    start = time.time()
+    if method == "LOCAL_BEST":
+        pkgs = local_search_best_improvement(m, b, c, a, pkg_deps, pkgs_grasp, budget=budget, stats=stats)
+        params = {"start": "GRASP", **GRASP_PARAMS}
+    elif method in ("LOCAL_FIRST", "GRASP+LS_FIRST"):
+        pkgs = local_search_first_improvement(m, b, c, a, pkg_deps, pkgs_grasp, budget=budget, stats=stats)
+        params = {"start": "GRASP", **GRASP_PARAMS}
+    elif method == "SA_FAST":
+        _, pkgs = simulated_annealing(m, b, c, a, pkg_deps, pkgs_grasp, seed=seed,
+                                      budget=budget, stats=stats, **SA_FAST_PARAMS)
+        params = dict(SA_FAST_PARAMS)
+    elif method == "SA_QUALITY":
+        _, pkgs = simulated_annealing(m, b, c, a, pkg_deps, pkgs_grasp, seed=seed,
+                                      budget=budget, stats=stats, **SA_QUALITY_PARAMS)
+        params = dict(SA_QUALITY_PARAMS)
+    elif method == "TABU":
+        _, pkgs = tabu_search(m, b, c, a, pkg_deps, pkgs_grasp, seed=seed,
+                              budget=budget, stats=stats, **TABU_PARAMS)
+        params = dict(TABU_PARAMS)
+    else:
+        raise ValueError(f"Método desconhecido: {method}")
+    elapsed = time.time() - start
+    if method == "GRASP+LS_FIRST":
+        elapsed += t_grasp
+    return pkgs, params, elapsed
+
+
+def method_params(method):
+    """Parâmetros que definem o resultado de um método (inclui o GRASP de partida)."""
+    if method == "RANDOM":
+        return dict(RANDOM_PARAMS)
+    if method == "GREEDY":
+        return {}
+    if method == "GRASP+PR":
+        return dict(GRASP_PR_PARAMS)
+    own = {"SA_FAST": SA_FAST_PARAMS, "SA_QUALITY": SA_QUALITY_PARAMS, "TABU": TABU_PARAMS}.get(method)
+    return {"grasp": GRASP_PARAMS, **({"method": own} if own else {})}
+
+
+def run_config(method, time_limit=None, max_evals=None, instrument=False, bound=False, reduce=False,
+               cache_size=None):
+    """Identificação curta (hash) da configuração de uma célula: vai na chave de retomada."""
+    cfg = {"params": method_params(method), "time_limit": time_limit, "max_evals": max_evals,
+           "instrument": instrument, "bound": bound, "reduce": reduce,
+           "cache": cache_size if method == "GRASP+PR" else None}
+    return hashlib.sha1(json.dumps(cfg, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _run_cell(cell):
+    path, method, seed, time_limit, max_evals, instrument, ub, reduce, cache_size, config = cell
+    m, n, ne, b, c, a, pkg_deps = _instance(path)
+    inst, reduction = (m, n, ne, b, c, a, pkg_deps), None
+    if reduce:
+        inst, reduction = _reduced(path)
+    budget = None
+    if time_limit is not None or max_evals is not None or ub is not None:
+        # na instância reduzida o valor não inclui os pacotes fixados
+        target = ub - reduction.offset if ub is not None and reduction else ub
+        budget = Budget(time_limit=time_limit, max_evals=max_evals, target=target)
+    stats = SolverStats() if instrument else None
+    cache = EvalCache(inst[0], cache_size) if cache_size and method == "GRASP+PR" else None
+    if inst[0] == 0:   # redução fixou tudo
+        pkgs, params, elapsed = [], {}, 0.0
+    else:
+        pkgs, params, elapsed = run_method(method, inst, seed, budget, stats, cache)
+    if reduction is not None:
+        pkgs = reduction.to_original(pkgs)
+        params = {**params, "reduction": reduction.stats}
+    rec = record_from_solution(path, method, seed, pkgs, pkg_deps, c, a, b, params, elapsed, ub)
+    rec["config"] = config
+    if time_limit is not None or max_evals is not None:
+        rec["params"] = {**params, "time_limit": time_limit, "max_evals": max_evals}
+        rec["trace"] = budget.trace
+    if stats is not None:
+        rec["stats"] = stats.to_record()
+    if cache is not None:
+        rec.setdefault("stats", {})["cache"] = cache.to_record()
+    return rec
+
+
+def run_grid(instances, methods, seeds, results_path="resultados.db", workers=None,
+             time_limit=None, max_evals=None, instrument=False, bound=False, reduce=False,
+             cache_size=None):
+    with ResultsStore(results_path) as store:
+        done = store.done_keys()
+        # limitantes calculados (ou lidos do cache) uma vez por instância
+        ubs = {path: upper_bound(path) if bound else None for path in instances}
+        if reduce:
+            for path in instances:
+                print(f"redução {os.path.basename(path)}: {_reduced(path)[1].describe()}")
+        configs = {method: run_config(method, time_limit, max_evals, instrument, bound, reduce, cache_size)
+                   for method in methods}
+        cells = [(path, method, seed, time_limit, max_evals, instrument, ubs[path], reduce, cache_size,
+                  configs[method])
+                 for path in instances for method in methods for seed in seeds
+                 if (os.path.basename(path), method, seed, configs[method]) not in done]
+        total = len(instances) * len(methods) * len(seeds)
+        print(f"{len(cells)} células a rodar ({total - len(cells)} já gravadas com esta configuração)")
+        if not cells:
+            return
+        with Pool(workers) as pool:
+            for k, rec in enumerate(pool.imap_unordered(_run_cell, cells), 1):
+                # só o processo principal grava: um commit por célula terminada
+                store.add(rec)
+                print(f"[{k}/{len(cells)}] {rec['instance']} {rec['method']} seed={rec['seed']}: "
+                      f"valor={rec['best_value']} peso={rec['total_weight']}/{rec['capacity']} "
+                      f"tempo={rec['time_seconds']:.4f}s"
+                      + (f" gap={rec['gap']:.2%}" if rec["gap"] is not None else ""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rodada em lote instâncias x métodos x sementes")
+    parser.add_argument("--instances", nargs="+", default=["prob-software*.txt"])
+    parser.add_argument("--methods", nargs="+", default=METHODS, choices=METHODS)
+    parser.add_argument("--seeds", nargs="+", type=int, default=[1, 2, 3])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="resultados.db")
+    parser.add_argument("--time-limit", type=float, default=None, help="segundos por célula")
+    parser.add_argument("--max-evals", type=int, default=None, help="avaliações por célula")
+    parser.add_argument("--instrument", action="store_true", help="grava contadores/tempos do SA, da busca tabu e da busca local")
+    parser.add_argument("--bound", action="store_true", help="grava limitante superior/gap e para ao atingir o limitante")
+    parser.add_argument("--reduce", action="store_true", help="roda os solvers na instância reduzida (reduction.py)")
+    parser.add_argument("--cache", type=int, default=None, help="entradas do cache de avaliações (zobrist.py)")
+    args = parser.parse_args()
+
+    instances = sorted({p for pattern in args.instances for p in glob.glob(pattern)})
+    run_grid(instances, args.methods, args.seeds, args.out, args.workers,
+             args.time_limit, args.max_evals, args.instrument, args.bound, args.reduce,
+             args.cache)
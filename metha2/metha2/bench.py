@@ -0,0 +1,249 @@
+import argparse, glob, json, os, random, sys, time, tracemalloc
+
+from utils import read_instance, marginal_cost, solution_weight, deps_of_solution
+from local_search import delta_cost_swap
+from solution_state import SolutionState, make_state
+from constructive import constructive_greedy, constructive_greedy_lazy, constructive_grasp
+from budget import Budget
+from instrumentation import SolverStats
+from batch_runner import METHODS, run_method
+
+# Micro-benchmarks dos kernels e dos métodos completos.
+#  - kernels: avaliações/s de marginal_cost, delta_cost_swap, solution_weight,
+#    dos deltas do SolutionState e das construções (cada um em sets e em bitset,
+#    chaves "bitset.*")
+#  - métodos (os de batch_runner): avaliações/s e movimentos/s (pelo Budget e
+#    pelo SolverStats), pico de memória (tracemalloc, em uma rodada à parte
+#    para não distorcer o tempo) e tempo até o valor alvo; cada método roda
+#    --repeats vezes e vale a melhor rodada (menor tempo, maior vazão): carga
+#    passageira da máquina só piora rodadas, e uma rodada só oscila mais que o
+#    --threshold
+#  - baseline em JSON: --save-baseline grava, as rodadas seguintes comparam e
+#    marcam REGRESSÃO quando a vazão cai (ou o tempo sobe) além de --threshold
+#
+# uso: python bench.py --instances "prob-software*.txt" --save-baseline
+#      python bench.py --instances prob-software9.txt --methods GRASP SA_FAST
+
+DEFAULT_BASELINE = "bench_baseline.json"
+KERNEL_MIN_TIME = 0.2   # segundos mínimos de repetição por kernel
+KERNEL_WINDOWS = 3      # janelas de KERNEL_MIN_TIME por kernel; vale a melhor
+METHOD_REPEATS = 5      # rodadas por método; vale a melhor
+
+
+def _throughput(fn, cases, min_time=KERNEL_MIN_TIME):
+    """Repete fn(*case) sobre cases até min_time; devolve avaliações por segundo."""
+    if not cases:
+        return None
+    evals = 0
+    start = time.perf_counter()
+    while True:
+        for case in cases:
+            fn(*case)
+        evals += len(cases)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return evals / elapsed
+
+
+def _peak_memory(fn):
+    """Pico de memória alocada (bytes) durante fn()."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_kernels(inst, seed=1, max_cases=2000, windows=KERNEL_WINDOWS):
+    """Vazão (avaliações/s) de cada kernel a partir de uma solução GRASP da instância."""
+    m, n, ne, b, c, a, pkg_deps = inst
+    sets = list(pkg_deps)   # mesma instância, sem as máscaras
+    _, current = constructive_grasp(m, b, c, a, sets, iters=5, rcl_size=8, seed=seed)
+    current = set(current)
+    chosen = deps_of_solution(current, sets)
+    outside = [p for p in range(m) if p not in current]
+    rng = random.Random(seed)
+    pairs = [(p_out, p_in) for p_out in current for p_in in outside]
+    if len(pairs) > max_cases:
+        pairs = rng.sample(pairs, max_cases)
+
+    state = SolutionState(c, a, sets, current)
+    bits = make_state(c, a, pkg_deps, current)
+    kernels = {
+        "marginal_cost": (marginal_cost, [(p, chosen, sets, a) for p in outside]),
+        "delta_cost_swap": (delta_cost_swap, [(po, pi, current, sets, a) for po, pi in pairs[:200]]),
+        "solution_weight": (solution_weight, [(current, sets, a)]),
+        "state.delta_add": (state.delta_add, [(p,) for p in outside]),
+        "state.delta_swap": (state.delta_swap, pairs),
+        "bitset.delta_add": (bits.delta_add, [(p,) for p in outside]),
+        "bitset.delta_swap": (bits.delta_swap, pairs),
+        # construções: uma "avaliação" = uma construção completa, nas duas
+        # representações (sets e bitset) para comparar guloso e guloso lazy lado a lado
+        "constructive_greedy": (constructive_greedy, [(m, b, c, a, sets)]),
+        "constructive_greedy_lazy": (constructive_greedy_lazy, [(m, b, c, a, sets)]),
+        "constructive_grasp": (constructive_grasp, [(m, b, c, a, sets, 1, 8, seed)]),
+        "bitset.constructive_greedy": (constructive_greedy, [(m, b, c, a, pkg_deps)]),
+        "bitset.constructive_greedy_lazy": (constructive_greedy_lazy, [(m, b, c, a, pkg_deps)]),
+        "bitset.constructive_grasp": (constructive_grasp, [(m, b, c, a, pkg_deps, 1, 8, seed)]),
+    }
+    # janelas intercaladas entre os kernels: uma carga passageira da máquina não
+    # pega todas as janelas do mesmo kernel; vale a melhor vazão de cada um
+    out = dict.fromkeys(kernels)
+    for _ in range(windows):
+        for name, (fn, cases) in kernels.items():
+            rate = _throughput(fn, cases)
+            if rate is not None and (out[name] is None or rate > out[name]):
+                out[name] = rate
+    return out
+
+
+def _best(values, higher_is_better=False):
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    return max(values) if higher_is_better else min(values)
+
+
+def _run_once(method, inst, seed):
+    """Uma rodada de um método de batch_runner com Budget (sem limite) e SolverStats."""
+    c = inst[4]
+    budget = Budget()
+    stats = SolverStats()
+    start = time.perf_counter()
+    pkgs, _, elapsed = run_method(method, inst, seed, budget, stats)
+    total = time.perf_counter() - start
+    moves = (stats.counters["flip_moves"] + stats.counters["swap_moves"]
+             + stats.counters["accepted"])
+    return {
+        "value": sum(c[p] for p in pkgs),
+        "time": elapsed,
+        "evals_per_s": budget.evals / elapsed if elapsed > 0 and budget.evals else None,
+        "moves_per_s": moves / elapsed if elapsed > 0 and moves else None,
+        "trace": budget.trace,
+        "wall": total,
+    }
+
+
+def _summarize(runs):
+    """Melhor rodada de cada métrica (menor tempo, maior vazão); "traces" guarda todos os traces."""
+    rec = {name: _best([r[name] for r in runs], name.endswith("_per_s"))
+           for name in ("time", "evals_per_s", "moves_per_s", "wall")}
+    rec["value"] = max(r["value"] for r in runs)
+    rec["traces"] = [r["trace"] for r in runs]
+    return rec
+
+
+def bench_methods(methods, inst, seed=1, memory=True, repeats=METHOD_REPEATS):
+    """
+    {método: métricas}, com repeats rodadas de cada método (mesma semente)
+    intercaladas entre os métodos; ver _summarize. O pico de memória vem de
+    uma rodada à parte com tracemalloc.
+    """
+    runs = {method: [] for method in methods}
+    for _ in range(max(1, repeats)):
+        for method in methods:
+            runs[method].append(_run_once(method, inst, seed))
+    out = {}
+    for method in methods:
+        rec = out[method] = _summarize(runs[method])
+        if memory:
+            rec["peak_mb"] = _peak_memory(lambda: run_method(method, inst, seed)) / 2**20
+    return out
+
+
+def time_to_target(trace, target):
+    """Primeiro instante do trace (tempo, avaliações, valor) com valor >= target."""
+    for t, _, value in trace:
+        if value >= target:
+            return t
+    return None
+
+
+def compare(current, baseline, threshold):
+    """
+    Lista de regressões (chave, métrica, baseline, atual). Vazões (*_per_s)
+    regridem se caírem mais que threshold; tempos e memória, se subirem.
+    """
+    out = []
+    for key, metrics in current.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        for name, value in metrics.items():
+            old = base.get(name)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+                continue
+            if name in ("value", "target"):
+                continue
+            higher_is_better = name.endswith("_per_s")
+            if higher_is_better and value < old * (1 - threshold):
+                out.append((key, name, old, value))
+            elif not higher_is_better and value > old * (1 + threshold):
+                out.append((key, name, old, value))
+    return out
+
+
+def _fmt(v, spec):
+    return "-" if v is None else format(v, spec)
+
+
+def run_bench(instances, methods, seed=1, memory=True, kernels=True, repeats=METHOD_REPEATS):
+    """Devolve {chave: métricas}; chaves "kernel:<inst>:<kernel>" e "method:<inst>:<método>"."""
+    results = {}
+    for path in instances:
+        name = os.path.basename(path)
+        inst = read_instance(path, bitset=True)
+        print(f"== {name} (m={inst[0]}, n={inst[1]})")
+        if kernels:
+            for kernel, rate in bench_kernels(inst, seed).items():
+                results[f"kernel:{name}:{kernel}"] = {"evals_per_s": rate}
+                print(f"   {kernel:<32} {_fmt(rate, '>14,.0f')} aval/s")
+
+        runs = bench_methods(methods, inst, seed, memory, repeats)
+        target = max((r["value"] for r in runs.values()), default=None)
+        for method, r in runs.items():
+            ttt = _best([time_to_target(trace, target) for trace in r.pop("traces")])
+            r["target"], r["time_to_target"] = target, ttt
+            results[f"method:{name}:{method}"] = r
+            print(f"   {method:<16} valor={r['value']:>7} tempo={r['time']:>8.3f}s "
+                  f"aval/s={_fmt(r['evals_per_s'], '>12,.0f')} mov/s={_fmt(r['moves_per_s'], '>10,.0f')} "
+                  f"pico={_fmt(r.get('peak_mb'), '>7.2f')}MB alvo({target})={_fmt(ttt, '.3f')}s")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-benchmarks dos kernels e métodos")
+    parser.add_argument("--instances", nargs="+", default=["prob-software*.txt"])
+    parser.add_argument("--methods", nargs="+", default=METHODS, choices=METHODS)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="grava as medidas como nova baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="variação relativa tolerada (0.2 = 20%%)")
+    parser.add_argument("--no-memory", action="store_true", help="pula a rodada com tracemalloc")
+    parser.add_argument("--no-kernels", action="store_true")
+    parser.add_argument("--repeats", type=int, default=METHOD_REPEATS, help="rodadas por método (vale a melhor)")
+    args = parser.parse_args()
+
+    instances = sorted({p for pattern in args.instances for p in glob.glob(pattern)})
+    results = run_bench(instances, args.methods, args.seed,
+                        memory=not args.no_memory, kernels=not args.no_kernels, repeats=args.repeats)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+        print(f"baseline gravada em {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for key, name, old, new in regressions:
+            print(f"REGRESSÃO {key} {name}: {old:.4g} -> {new:.4g}")
+        if not regressions:
+            print(f"sem regressões além de {args.threshold:.0%} (baseline {args.baseline})")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,58 @@
+from typing import List, Set
+
+
+class BitsetDeps(list):
+    """
+    Representação alternativa de pkg_deps usando bitsets (ints do Python).
+    Continua sendo uma lista de sets (funções antigas seguem funcionando),
+    mas guarda também:
+      - masks[p]: bit d ligado se o pacote p depende de d
+      - planes: "tabela de pesos" em planos de bits; o plano k tem o bit d
+        ligado se o bit k de a[d] for 1. Assim o peso de um conjunto X é
+        sum(popcount(X & plano_k) << k), tudo em operações de palavra.
+      - csr: (indptr, indices) da leitura, se vieram junto (read_instance);
+        poupa remontar a matriz de incidência (ver incidence_csr)
+    """
+
+    def __init__(self, pkg_deps: List[Set[int]], a: List[int], csr=None):
+        super().__init__(pkg_deps)
+        self.masks = [deps_to_mask(s) for s in pkg_deps]
+        self.planes = weight_planes(a)
+        self.csr = csr
+
+
+def deps_to_mask(deps) -> int:
+    mask = 0
+    for d in deps:
+        mask |= 1 << d
+    return mask
+
+def mask_to_deps(mask: int) -> Set[int]:
+    deps = set()
+    while mask:
+        low = mask & -mask
+        deps.add(low.bit_length() - 1)
+        mask ^= low
+    return deps
+
+def weight_planes(a: List[int]):
+    # lista de (plano, deslocamento) só para os planos não vazios
+    planes = []
+    for k in range(max(a, default=0).bit_length()):
+        plane = 0
+        for d, w in enumerate(a):
+            if (w >> k) & 1:
+                plane |= 1 << d
+        if plane:
+            planes.append((plane, k))
+    return planes
+
+def weighted_popcount(mask: int, planes) -> int:
+    total = 0
+    for plane, k in planes:
+        total += (mask & plane).bit_count() << k
+    return total
+
+def marginal_cost_bits(pkg: int, chosen_mask: int, deps: BitsetDeps) -> int:
+    """Equivalente a utils.marginal_cost, mas com chosen_deps como bitset."""
+    return weighted_popcount(deps.masks[pkg] & ~chosen_mask, deps.planes)
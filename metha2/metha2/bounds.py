@@ -0,0 +1,136 @@
+import json, math, os, sys
+
+import numpy as np
+
+from instance_cache import load_instance_arrays, _cache_location, _write_json
+from utils import read_instance
+from constructive import constructive_greedy_lazy
+
+# Limitante superior (dual) para o problema de seleção de pacotes.
+#
+# Relaxação linear (set-union knapsack):
+#   max sum c_p x_p   s.a.  x_p <= y_d  (d em deps(p)),  sum a_d y_d <= b,  0 <= x, y <= 1
+# Relaxando as restrições x_p <= y_d com multiplicadores mu_pd >= 0 (um por aresta)
+# o problema separa em duas partes triviais:
+#   L(mu) = sum_p max(0, c_p - M_p) + mochila fracionária(lucro nu_d, peso a_d, cap. b)
+#   com M_p = sum_d mu_pd e nu_d = sum_p mu_pd.
+# Qualquer mu >= 0 dá um limitante válido, e o mínimo de L(mu) é o valor da relaxação
+# linear; o mínimo é aproximado por subgradiente (passo de Polyak), tudo vetorizado
+# sobre as ne arestas. Como c é inteiro, o limitante é arredondado para baixo.
+# (O dual lagrangiano da capacidade dá o mesmo valor: o subproblema de fecho tem
+# a propriedade de integralidade.) Nas instâncias prob-software essa relaxação é
+# fraca: o ótimo é perto de y_d = b / sum(a) para toda d, e cresce com a densidade
+# (deps por pacote). Gaps medidos contra a melhor de 3 rodadas GRASP + tabu:
+#   prob-software 33%, 8 34%, 3 38%, 5 47%, 4 71%, 9 80%, 6 83%, 2 87%, 10 e 7 92%.
+# Com gaps assim a parada ao atingir o limitante (Budget(target=ub)) não dispara;
+# o limitante serve para comparar rodadas, não como critério de parada.
+#
+# Os limitantes ficam em .instance_cache/<instância>/bound.json (ver instance_cache.py).
+#
+# uso: python bounds.py prob-software*.txt
+
+BOUND_ITERS = 1000
+
+
+def _fractional_knapsack(profit, a, b):
+    """y ótimo da mochila fracionária (só itens com lucro > 0)."""
+    y = np.zeros(len(a))
+    items = np.flatnonzero(profit > 0)
+    if len(items) == 0:
+        return y
+    free = items[a[items] == 0]
+    y[free] = 1.0
+    items = items[a[items] > 0]
+    order = items[np.argsort(-profit[items] / a[items], kind="stable")]
+    cum = np.cumsum(a[order])
+    full = cum <= b
+    y[order[full]] = 1.0
+    k = int(full.sum())
+    if k < len(order):
+        rest = b - (cum[k - 1] if k else 0)
+        y[order[k]] = rest / a[order[k]]
+    return y
+
+
+def lagrangian_bound(b, c, a, indptr, indices, lower=None, iters=BOUND_ITERS):
+    """
+    Limitante superior (float) pelo dual lagrangiano da relaxação linear.
+    lower (valor de uma solução conhecida) acelera o passo de Polyak.
+    """
+    c = np.asarray(c, dtype=float)
+    a = np.asarray(a, dtype=float)
+    indices = np.asarray(indices)
+    m, n = len(c), len(a)
+    deg = np.diff(np.asarray(indptr))
+    rows = np.repeat(np.arange(m), deg)
+
+    # fixação: pacote cujas deps sozinhas passam de b nunca entra (x_p = 0)
+    own = np.bincount(rows, a[indices], m)
+    c = np.where(own > b, 0.0, c)
+
+    # ponto de partida: c_p dividido igualmente entre as deps de p
+    mu = np.where(c[rows] > 0, c[rows] / np.maximum(deg[rows], 1), 0.0)
+    target = 0.0 if lower is None else float(lower)
+    best = math.inf
+    theta = 2.0
+    stall = 0
+    for _ in range(iters):
+        M = np.bincount(rows, mu, m)
+        nu = np.bincount(indices, mu, n)
+        gain = c - M
+        x = gain > 0
+        y = _fractional_knapsack(nu, a, b)
+        L = gain[x].sum() + nu @ y
+        if L < best - 1e-9:
+            best, stall = L, 0
+        else:
+            stall += 1
+            if stall >= 20:
+                theta, stall = theta / 2, 0
+        g = y[indices] - x[rows]   # subgradiente em relação a mu
+        norm = g @ g
+        if norm == 0 or best - target < 1e-6 or theta < 1e-4:
+            break
+        mu = np.maximum(0.0, mu - theta * (L - target) / norm * g)
+    return best
+
+
+def upper_bound(path, iters=BOUND_ITERS, use_cache=True, cache_dir=None):
+    """
+    Limitante superior inteiro da instância em path, com cache por instância
+    (invalidado quando o arquivo muda, junto com o cache da instância).
+    """
+    m, n, ne, b, c, a, indptr, indices = load_instance_arrays(path, use_cache=use_cache, cache_dir=cache_dir)
+    bound_path = os.path.join(_cache_location(path, cache_dir), "bound.json")
+    meta_path = os.path.join(_cache_location(path, cache_dir), "meta.json")
+    sha1 = None
+    if use_cache and os.path.exists(meta_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            sha1 = json.load(f)["sha1"]
+        if os.path.exists(bound_path):
+            with open(bound_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached["sha1"] == sha1 and cached["iters"] >= iters:
+                return cached["upper_bound"]
+
+    # solução gulosa como limitante inferior para o passo de Polyak
+    _, _, _, _, c_list, a_list, pkg_deps = read_instance(path, cache=use_cache)
+    lower, _ = constructive_greedy_lazy(m, b, c_list, a_list, pkg_deps)
+    ub = int(math.floor(lagrangian_bound(b, c, a, indptr, indices, lower, iters) + 1e-6))
+    if sha1 is not None:
+        _write_json(bound_path, {"sha1": sha1, "iters": iters, "upper_bound": ub, "lower": lower})
+    return ub
+
+
+def optimality_gap(value, ub):
+    """Gap relativo (ub - valor) / ub; 0.0 quando a solução atinge o limitante."""
+    if ub is None:
+        return None
+    if ub <= 0:
+        return 0.0
+    return max(0.0, (ub - value) / ub)
+
+
+if __name__ == "__main__":
+    for p in sys.argv[1:]:
+        print(f"{p}: limitante superior {upper_bound(p)}")
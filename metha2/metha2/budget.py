@@ -0,0 +1,53 @@
+import time
+
+
+class Budget:
+    """
+    Orçamento de execução para os solvers ("anytime"):
+      - time_limit: segundos de relógio a partir da criação
+      - max_evals: número máximo de avaliações (cada movimento/candidato avaliado)
+      - target: valor alvo (ex.: limitante superior, ver bounds.py); ao registrar
+        uma solução com valor >= target o orçamento é dado como esgotado
+    Os solvers que recebem budget=... param quando ele se esgota e devolvem
+    a melhor solução até ali. O histórico de convergência fica em trace,
+    como tuplas (tempo, avaliações, melhor valor).
+    """
+
+    def __init__(self, time_limit: float | None = None, max_evals: int | None = None,
+                 target: int | None = None):
+        self.time_limit = time_limit
+        self.max_evals = max_evals
+        self.target = target
+        self.restart()
+
+    def restart(self) -> None:
+        """Zera relógio, contagem e trace (ex.: quando a fase medida começa depois)."""
+        self.start = time.perf_counter()
+        self.deadline = None if self.time_limit is None else self.start + self.time_limit
+        self.evals = 0
+        self.best = None
+        self.trace = []
+        self.reached = False
+
+    def exhausted(self) -> bool:
+        if self.reached:
+            return True
+        if self.max_evals is not None and self.evals >= self.max_evals:
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def spend(self, k: int = 1) -> bool:
+        """Conta k avaliações; devolve True se o orçamento acabou."""
+        self.evals += k
+        return self.exhausted()
+
+    def record(self, value) -> None:
+        """Registra um valor de solução; entra no trace só se melhorar."""
+        if self.best is None or value > self.best:
+            self.best = value
+            self.trace.append((time.perf_counter() - self.start, self.evals, value))
+            if self.target is not None and value >= self.target:
+                self.reached = True
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
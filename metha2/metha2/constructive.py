@@ -1,50 +1,54 @@
+import heapq
 import random
 import time
-from typing import List, Set, Tuple
-from utils import marginal_cost, solution_value, solution_weight
+from typing import List, Tuple
+from solution_state import make_state
+
+# budget (opcional, ver budget.py): limite de tempo/avaliações; todas as funções
+# abaixo param quando ele acaba e devolvem a melhor solução (viável) até ali
 
 #1 funcao de construcao aleatoria
-def constructive_random(m, b, c, a, pkg_deps, restarts=50, seed=None):
+def constructive_random(m, b, c, a, pkg_deps, restarts=50, seed=None, budget=None):
     rng = random.Random() if seed is None else random.Random(seed)
     best = (0, set())     # (valor,pacotes)
     for _ in range(restarts):
         order = list(range(m))
         rng.shuffle(order)
-        chosen_pkgs = set()
-        chosen_deps = set()
-        used = 0
+        state = make_state(c, a, pkg_deps)
+        stop = False
         for p in order:
-            cost = marginal_cost(p, chosen_deps, pkg_deps, a)
-            if used + cost <= b:
-                chosen_pkgs.add(p)
+            cost = state.delta_add(p)
+            if state.weight + cost <= b:
                 #atualiza dependências e peso
-                new_deps = pkg_deps[p] - chosen_deps
-                chosen_deps |= new_deps
-                used += sum(a[d] for d in new_deps)
-        val = solution_value(chosen_pkgs, c)
-        if val > best[0]:
-            best = (val, chosen_pkgs)
+                state.add(p)
+            if budget is not None and budget.spend():
+                stop = True
+                break
+        if state.value > best[0]:
+            best = (state.value, state.selected)
+        if budget is not None:
+            budget.record(best[0])
+        if stop:
+            break
     return best
 
 # 2 guloso ( utilizando a razao; razão benefício / custo marginal)
-def constructive_greedy(m, b, c, a, pkg_deps):
-    chosen_pkgs = set()
-    chosen_deps = set()
-    used = 0
+def constructive_greedy(m, b, c, a, pkg_deps, budget=None):
+    state = make_state(c, a, pkg_deps)
     remaining = set(range(m))
-    while True:
+    while budget is None or not budget.spend(len(remaining)):
         best_p = None
         best_score = -1
         best_cost = None
         for p in remaining:
-            cost = marginal_cost(p, chosen_deps, pkg_deps, a)
+            cost = state.delta_add(p)
             if cost <= 0:
                 # se todas deps já presentes ,escolha imediata
                 best_p = p
                 best_cost = 0
                 best_score = float('inf')
                 break
-            if used + cost <= b:
+            if state.weight + cost <= b:
                 score = c[p] / cost
                 if score > best_score:
                     best_score = score
@@ -53,30 +57,84 @@ def constructive_greedy(m, b, c, a, pkg_deps):
         if best_p is None:
             break
         # add pacote
-        chosen_pkgs.add(best_p)
-        new_deps = pkg_deps[best_p] - chosen_deps
-        chosen_deps |= new_deps
-        used += sum(a[d] for d in new_deps)
+        state.add(best_p)
         remaining.remove(best_p)
-    return solution_value(chosen_pkgs, c), chosen_pkgs
+        if budget is not None:
+            budget.record(state.value)
+    return state.value, state.selected
+
+# 2b guloso preguiçoso (lazy): mesma solução do guloso acima, com heap + índice inverso
+# o custo marginal de um pacote só muda quando alguma dep dele entra na solução,
+# então só esses pacotes são reavaliados a cada escolha
+def constructive_greedy_lazy(m, b, c, a, pkg_deps, budget=None):
+    state = make_state(c, a, pkg_deps)
+    # índice inverso dependência -> pacotes que a exigem
+    dep_pkgs = [[] for _ in range(len(a))]
+    for p in range(m):
+        for d in pkg_deps[p]:
+            dep_pkgs[d].append(p)
+
+    # custo marginal corrente de cada pacote (só diminui)
+    cur_cost = [sum(a[d] for d in pkg_deps[p]) for p in range(m)]
+    heap = []  # (-score, p, custo); desempate pelo menor p, como no guloso
+
+    def push(p):
+        cost = cur_cost[p]
+        score = float('inf') if cost <= 0 else c[p] / cost
+        if score > -1:
+            heapq.heappush(heap, (-score, p, cost))
+
+    for p in range(m):
+        push(p)
+
+    chosen = [False] * m
+    while heap:
+        if budget is not None and budget.spend():
+            break
+        _, p, cost = heapq.heappop(heap)
+        if chosen[p] or cost != cur_cost[p]:
+            continue  # entrada velha
+        if cost > 0 and state.weight + cost > b:
+            continue  # não cabe; só volta ao heap se o custo dele cair
+        new_deps = [d for d in pkg_deps[p] if state.dep_count[d] == 0]
+        state.add(p)
+        chosen[p] = True
+        if budget is not None:
+            budget.record(state.value)
+        # desconta as deps recém-adicionadas só de quem as exige
+        affected = set()
+        for d in new_deps:
+            w = a[d]
+            for q in dep_pkgs[d]:
+                cur_cost[q] -= w
+            affected.update(dep_pkgs[d])
+        for q in affected:
+            if not chosen[q]:
+                push(q)
+    return state.value, state.selected
 
 # 3 Guloso random (com Rcl)
-def constructive_grasp(m, b, c, a, pkg_deps, iters=50, rcl_size=10, seed=123):
+# cache (opcional, ver zobrist.py): registra cada construção (tag "grasp") para medir,
+# pelos contadores do cache, quantas se repetem; não muda o resultado nem poupa trabalho
+def constructive_grasp(m, b, c, a, pkg_deps, iters=50, rcl_size=10, seed=123, budget=None, cache=None):
     rng = random.Random(time.time() if seed is None else seed)
+    keys = cache.keys if cache is not None else None
     best = (0, set())
+    stop = False
     for _ in range(iters):
-        chosen_pkgs = set()
-        chosen_deps = set()
-        used = 0
+        state = make_state(c, a, pkg_deps, keys=keys)
         remaining = set(range(m))
         while True:
+            if budget is not None and budget.spend(len(remaining)):
+                stop = True
+                break
             # calcula razões marginais para candidatos que cabem
             scored: List[Tuple[float, int, int]] = []  # (score, p, cost)
             for p in remaining:
-                cost = marginal_cost(p, chosen_deps, pkg_deps, a)
+                cost = state.delta_add(p)
                 if cost <= 0:
                     scored.append((float('inf'), p, 0))
-                elif used + cost <= b:
+                elif state.weight + cost <= b:
                     scored.append((c[p]/cost, p, cost))
             if not scored:
                 break
@@ -85,12 +143,14 @@ def constructive_grasp(m, b, c, a, pkg_deps, iters=50, rcl_size=10, seed=123):
             rcl = scored[:max(1, min(rcl_size, len(scored)))]
             # escolhe aleatoriamente da rCL
             _, p, cost = rng.choice(rcl)
-            chosen_pkgs.add(p)
-            new_deps = pkg_deps[p] - chosen_deps
-            chosen_deps |= new_deps
-            used += sum(a[d] for d in new_deps)
+            state.add(p)
             remaining.remove(p)
-        val = solution_value(chosen_pkgs, c)
-        if val > best[0]:
-            best = (val, chosen_pkgs)
+        if cache is not None and cache.get("grasp", state.hash) is None:
+            cache.put("grasp", state.hash, (state.value, state.weight))
+        if state.value > best[0]:
+            best = (state.value, state.selected)
+        if budget is not None:
+            budget.record(best[0])
+        if stop:
+            break
     return best
@@ -0,0 +1,157 @@
+import numpy as np
+
+# Construção em lote (NumPy): K soluções GRASP/aleatórias construídas ao mesmo tempo.
+# Estado em matrizes K x m (pacotes escolhidos) e K x n (deps cobertas); a cada passo
+# o custo marginal de todos os pacotes para todas as K soluções sai de um único
+# produto com a matriz de incidência pacote->dependência em formato CSR.
+
+
+def incidence_csr(pkg_deps):
+    """
+    Matriz de incidência pacote->dependência em CSR:
+      indices[indptr[p]:indptr[p+1]] = deps do pacote p (ordenadas)
+    Reaproveita a CSR da leitura quando pkg_deps a traz (BitsetDeps.csr).
+    """
+    csr = getattr(pkg_deps, "csr", None)
+    if csr is not None:
+        return csr
+    indptr = np.zeros(len(pkg_deps) + 1, dtype=np.int64)
+    for p, deps in enumerate(pkg_deps):
+        indptr[p + 1] = indptr[p] + len(deps)
+    indices = np.fromiter((d for deps in pkg_deps for d in sorted(deps)),
+                          dtype=np.int64, count=int(indptr[-1]))
+    return indptr, indices
+
+
+def _expand_ranges(indptr, rows):
+    # concatena indptr[r]:indptr[r+1] para cada r em rows (sem laço em Python)
+    starts = indptr[rows]
+    lens = indptr[rows + 1] - starts
+    total = int(lens.sum())
+    offsets = np.repeat(starts - (np.cumsum(lens) - lens), lens)
+    return offsets + np.arange(total, dtype=np.int64), lens
+
+
+def _construct_batch(b, c, a, csr, csr_t, K, rng, rcl_size, mode, budget=None):
+    """
+    Constrói K soluções em paralelo.
+      mode="grasp":  RCL com os rcl_size melhores c/custo, escolha uniforme
+      mode="random": ordem aleatória por solução (equivale ao constructive_random)
+    Devolve a matriz K x m de pacotes escolhidos.
+    budget (opcional, ver budget.py): cada passo gasta uma avaliação por pacote
+    ainda fora de cada solução ativa, como o constructive_grasp; se acabar, as
+    construções param onde estão (soluções parciais, mas viáveis).
+    """
+    indptr, indices = csr
+    t_indptr, t_indices = csr_t
+    m, n = len(c), len(a)
+    chosen = np.zeros((K, m), dtype=bool)
+    covered = np.zeros((K, n), dtype=bool)
+    used = np.zeros(K, dtype=np.int64)
+    active = np.ones(K, dtype=bool)
+    # custo marginal corrente (K x m): começa com o peso total das deps de cada pacote
+    full = np.add.reduceat(np.append(a[indices], 0), indptr[:-1]) * (np.diff(indptr) > 0)
+    cost = np.tile(full, (K, 1))
+
+    if mode == "random":
+        # prioridade aleatória fixa = ordem da varredura; pacotes "pulados"
+        # (não cabiam quando chegou a vez deles) nunca mais são considerados
+        priority = rng.random((K, m))
+        skipped = np.zeros((K, m), dtype=bool)
+
+    while active.any():
+        rows = np.flatnonzero(active)
+        if budget is not None and budget.spend(int(m * len(rows) - chosen[rows].sum())):
+            break
+        cost_r = cost[rows]
+        feasible = ~chosen[rows] & (used[rows, None] + cost_r <= b)
+
+        if mode == "random":
+            feasible &= ~skipped[rows]
+            score = np.where(feasible, priority[rows], -np.inf)
+            pick = np.argmax(score, axis=1)
+            has = feasible.any(axis=1)
+            # tudo que tinha prioridade maior e não coube foi pulado na varredura
+            skipped[rows] |= ~chosen[rows] & (priority[rows] > score[np.arange(len(rows)), pick][:, None])
+        else:
+            ratio = np.where(cost_r <= 0, np.inf, c / np.maximum(cost_r, 1))
+            score = np.where(feasible, ratio, -np.inf)
+            nv = feasible.sum(axis=1)
+            has = nv > 0
+            k = min(rcl_size, m)
+            if k < m:
+                top = np.argpartition(-score, k - 1, axis=1)[:, :k]
+            else:
+                top = np.tile(np.arange(m), (len(rows), 1))
+            order = np.argsort(-np.take_along_axis(score, top, axis=1), axis=1, kind="stable")
+            top = np.take_along_axis(top, order, axis=1)
+            # rcl = top min(k, nv) candidatos; escolhe uniformemente
+            r = np.maximum(np.minimum(k, nv), 1)
+            j = np.minimum((rng.random(len(rows)) * r).astype(np.int64), r - 1)
+            pick = top[np.arange(len(rows)), j]
+
+        active[rows[~has]] = False
+        rows, pick = rows[has], pick[has]
+        if len(rows) == 0:
+            break
+
+        # aplica as escolhas: deps novas de cada linha
+        edge_idx, lens = _expand_ranges(indptr, pick)
+        dep = indices[edge_idx]
+        row_of_edge = np.repeat(rows, lens)
+        new = ~covered[row_of_edge, dep]
+        dep, row_of_edge = dep[new], row_of_edge[new]
+        chosen[rows, pick] = True
+        covered[row_of_edge, dep] = True
+        used[rows] += cost[rows, pick]
+
+        # produto esparso: desconta a[d] de todo pacote que exige uma dep nova
+        edge_idx, lens = _expand_ranges(t_indptr, dep)
+        flat = np.repeat(row_of_edge, lens) * m + t_indices[edge_idx]
+        dec = np.bincount(flat, weights=np.repeat(a[dep], lens), minlength=K * m)
+        cost -= dec.astype(np.int64).reshape(K, m)
+
+    return chosen
+
+
+def _best_of_batches(m, b, c, a, pkg_deps, total, batch, seed, rcl_size, mode, budget=None):
+    rng = np.random.default_rng(seed)
+    if budget is not None and budget.max_evals is not None:
+        # orçamento em avaliações: uma construção por vez, senão um lote inteiro
+        # gastaria o orçamento em poucos passos e todas ficariam pela metade
+        batch = 1
+    csr = incidence_csr(pkg_deps)
+    # transposta: dependência -> pacotes que a exigem
+    dep_pkgs = [[] for _ in range(len(a))]
+    for p, deps in enumerate(pkg_deps):
+        for d in deps:
+            dep_pkgs[d].append(p)
+    csr_t = incidence_csr(dep_pkgs)
+    c_arr = np.asarray(c, dtype=np.int64)
+    a_arr = np.asarray(a, dtype=np.int64)
+    best = (0, set())
+    done = 0
+    while done < total:
+        K = min(batch, total - done)
+        chosen = _construct_batch(b, c_arr, a_arr, csr, csr_t, K, rng, rcl_size, mode, budget)
+        values = chosen @ c_arr
+        k = int(np.argmax(values))
+        if values[k] > best[0]:
+            best = (int(values[k]), set(np.flatnonzero(chosen[k]).tolist()))
+        done += K
+        if budget is not None:
+            budget.record(best[0])
+            if budget.exhausted():
+                break
+    return best
+
+
+# GRASP em lote: mesmas regras do constructive_grasp, K construções por vez
+# (sorteios do NumPy: mesma distribuição de soluções, não as mesmas soluções por semente)
+def constructive_grasp_batch(m, b, c, a, pkg_deps, iters=50, rcl_size=10, seed=123, batch=64, budget=None):
+    return _best_of_batches(m, b, c, a, pkg_deps, iters, batch, seed, rcl_size, "grasp", budget)
+
+
+# reinícios aleatórios em lote: mesmas regras do constructive_random
+def constructive_random_batch(m, b, c, a, pkg_deps, restarts=50, seed=None, batch=64, budget=None):
+    return _best_of_batches(m, b, c, a, pkg_deps, restarts, batch, seed, 1, "random", budget)
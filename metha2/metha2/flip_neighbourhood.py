@@ -0,0 +1,88 @@
+import numpy as np
+
+from constructive_batch import incidence_csr
+
+
+class FlipNeighbourhood:
+    """
+    Vizinhança FLIP (adicionar ou remover um pacote) avaliada toda de uma vez
+    com numpy, sobre um SolutionState:
+      - a relação pacote -> dependência fica em CSR (indptr, indices) e a
+        transposta em CSC (dep -> pacotes), montadas uma vez
+      - missing[d] indica se a dependência d ainda não é coberta; o custo de
+        adicionar cada pacote é o produto matriz-esparsa x vetor
+        add_cost = A @ (a * missing), calculado uma vez na criação
+      - depois de um movimento só mudam as deps que passaram a ser cobertas ou
+        ficaram descobertas, e só as linhas (pacotes) que as usam são
+        atualizadas, pela CSC (ver moved)
+    best_move fica em poucas operações vetoriais por passo, no lugar do laço
+    Python sobre os m pacotes com delta_add de cada um.
+    """
+
+    def __init__(self, m: int, b: int, state):
+        self.m = m
+        self.b = b
+        self.state = state
+        pkg_deps = state.pkg_deps
+        self.c = np.asarray(state.c, dtype=np.int64)
+        self.a = np.asarray(state.a, dtype=np.int64)
+        n = len(self.a)
+
+        # CSR: deps do pacote p = indices[indptr[p]:indptr[p+1]] (a da leitura, se houver)
+        self.indptr, self.indices = incidence_csr(pkg_deps)
+        rows = np.repeat(np.arange(m, dtype=np.int64), np.diff(self.indptr))
+        # CSC: pacotes que exigem d = col_rows[col_ptr[d]:col_ptr[d+1]]
+        order = np.argsort(self.indices, kind="stable")
+        self.col_rows = rows[order]
+        self.col_ptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=n), out=self.col_ptr[1:])
+
+        cnt = state.dep_count
+        self.missing = np.fromiter((cnt[d] == 0 for d in range(n)), dtype=bool, count=n)
+        self.selected = np.zeros(m, dtype=bool)
+        self.selected[list(state.selected)] = True
+        self.add_cost = np.bincount(rows, (self.a * self.missing)[self.indices], m).astype(np.int64)
+
+    def best_move(self, budget=None):
+        """
+        Melhor flip de melhora (p_out, None) / (None, p_in) ou None. Mesmo
+        movimento da varredura em Python: remoção ganha empates e, entre
+        adições, fica o menor p. O budget é gasto de uma vez (uma avaliação
+        por candidato a entrar).
+        """
+        state = self.state
+        if budget is not None:
+            budget.spend(self.m - len(state.selected))
+        best_move, best_gain = None, 0
+        if self.selected.any():
+            gain = np.where(self.selected, -self.c, 0)
+            p = int(gain.argmax())
+            if gain[p] > best_gain:
+                best_move, best_gain = (p, None), int(gain[p])
+        fits = ~self.selected & (self.add_cost <= self.b - state.weight)
+        gain = np.where(fits, self.c, 0)
+        p = int(gain.argmax())
+        if gain[p] > best_gain:
+            best_move = (None, p)
+        return best_move
+
+    def moved(self, p_out, p_in) -> None:
+        """Atualiza depois de state.apply(p_out, p_in)."""
+        cnt = self.state.dep_count
+        changed = []
+        if p_out is not None:
+            self.selected[p_out] = False
+            changed += [d for d in self._deps(p_out) if cnt[d] == 0]
+        if p_in is not None:
+            self.selected[p_in] = True
+            changed += [d for d in self._deps(p_in) if cnt[d] > 0 and self.missing[d]]
+        for d in changed:
+            rows = self.col_rows[self.col_ptr[d]:self.col_ptr[d + 1]]
+            if self.missing[d]:
+                self.add_cost[rows] -= self.a[d]
+            else:
+                self.add_cost[rows] += self.a[d]
+            self.missing[d] = not self.missing[d]
+
+    def _deps(self, p):
+        return self.indices[self.indptr[p]:self.indptr[p + 1]].tolist()
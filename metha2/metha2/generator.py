@@ -0,0 +1,124 @@
+import argparse
+
+import numpy as np
+
+# Gerador de instâncias sintéticas no formato de read_instance
+# (1 m n ne b / 2 benefícios c / 3 tamanhos a / ne linhas "pacote dependência"),
+# para testar os solvers em escalas maiores que as prob-software.
+#  - grau dos pacotes: "uniform" (em torno da média, que pode ser fracionária) ou
+#    "powerlaw" (cauda pesada);
+#    com "powerlaw" a popularidade das dependências também segue uma lei de
+#    potência (poucas deps exigidas por muitos pacotes, como bibliotecas base)
+#  - c, a: inteiros uniformes nos intervalos dados; b = tightness * sum(a)
+#  - as arestas são geradas e escritas em blocos de pacotes, então a memória
+#    fica em O(m + n + tamanho do bloco), mesmo com milhões de arestas
+#  - mesma semente -> mesmo arquivo
+# Deps repetidas dentro de um pacote são sorteadas de novo (até _RESAMPLE_ROUNDS
+# vezes; com lei de potência e grau perto de n o pacote pode ficar com menos).
+# O ne do cabeçalho é o número final, reescrito no fim (o campo é reservado com
+# espaços no início).
+#
+# uso: python generator.py saida.txt --m 100000 --n 20000 --avg-degree 12 --degree powerlaw --seed 1
+
+EDGES_PER_CHUNK = 1_000_000
+_NE_WIDTH = 20  # espaço reservado para ne no cabeçalho
+_RESAMPLE_ROUNDS = 20  # novos sorteios para repor deps repetidas
+
+
+def package_degrees(rng, m, n, avg_degree, degree="uniform", shape=2.0):
+    """
+    Grau (número de deps) de cada pacote, entre 1 e n, com média ~avg_degree.
+    Todo pacote tem ao menos uma dep, então avg_degree < 1 é rejeitado (ValueError).
+    """
+    if avg_degree < 1:
+        raise ValueError(f"Média de grau menor que 1 (todo pacote tem ao menos uma dep): {avg_degree}")
+    if degree == "uniform":
+        # uniforme em torno de k = floor(avg_degree) (média k) mais um Bernoulli com a parte
+        # fracionária, para a média ficar em avg_degree mesmo quando não é inteira
+        # (média inteira: sem sorteio extra, mesmo arquivo de antes para a mesma semente)
+        k = int(np.floor(avg_degree))
+        half = max(0, k - 1)
+        deg = rng.integers(k - half, k + half + 1, m)
+        if avg_degree > k:
+            deg = deg + (rng.random(m) < avg_degree - k)
+    elif degree == "powerlaw":
+        # Pareto (Lomax + 1) com média shape / (shape - 1), reescalada para avg_degree
+        x = rng.pareto(shape, m) + 1.0
+        deg = np.rint(x * avg_degree * (shape - 1) / shape)
+    else:
+        raise ValueError(f"Distribuição de grau desconhecida: {degree}")
+    return np.clip(deg, 1, n).astype(np.int64)
+
+
+def dependency_sampler(rng, n, degree="uniform", exponent=1.0):
+    """Função k -> k deps sorteadas (com reposição) segundo a popularidade das deps."""
+    if degree == "uniform":
+        return lambda k: rng.integers(0, n, k)
+    # popularidade ~ 1 / posto^exponent, com os postos embaralhados entre as deps
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    cum = np.cumsum(weights[rng.permutation(n)])
+    return lambda k: np.minimum(np.searchsorted(cum, rng.random(k) * cum[-1], side="right"), n - 1)
+
+
+def generate_instance(path, m, n, avg_degree=8.0, degree="uniform", c_range=(35, 520),
+                      a_range=(50, 330), tightness=0.75, seed=0, edges_per_chunk=EDGES_PER_CHUNK):
+    """
+    Escreve a instância em path e devolve (m, n, ne, b).
+    Intervalos fechados; tightness em (0, 1] é a fração de sum(a) usada como b.
+    """
+    rng = np.random.default_rng(seed)
+    c = rng.integers(c_range[0], c_range[1] + 1, m)
+    a = rng.integers(a_range[0], a_range[1] + 1, n)
+    b = int(round(tightness * int(a.sum())))
+    deg = package_degrees(rng, m, n, avg_degree, degree)
+    sample = dependency_sampler(rng, n, degree)
+
+    ne = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"{m} {n} {' ' * _NE_WIDTH} {b}\n")
+        f.write(" ".join(map(str, c.tolist())) + "\n")
+        f.write(" ".join(map(str, a.tolist())) + "\n")
+        start = 0
+        while start < m:
+            # bloco de pacotes [start, end) com ~edges_per_chunk arestas
+            end = start + max(1, int(np.searchsorted(np.cumsum(deg[start:]), edges_per_chunk)))
+            end = min(end, m)
+            want = deg[start:end]
+            keys = np.empty(0, dtype=np.int64)
+            missing = want
+            for _ in range(_RESAMPLE_ROUNDS):
+                # sorteia o que falta; ordena por (pacote, dep) e tira repetidas
+                rows = np.repeat(np.arange(start, end, dtype=np.int64), missing)
+                keys = np.sort(np.concatenate((keys, rows * n + sample(len(rows)))))
+                keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+                missing = want - np.bincount(keys // n - start, minlength=end - start)
+                if not missing.any():
+                    break
+            f.write("".join(f"{p} {d}\n" for p, d in zip((keys // n).tolist(), (keys % n).tolist())))
+            ne += len(keys)
+            start = end
+        # grava o ne final no espaço reservado
+        f.seek(0)
+        f.write(f"{m} {n} {ne:<{_NE_WIDTH}} {b}")
+    return m, n, ne, b
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera instâncias sintéticas no formato prob-software.")
+    parser.add_argument("out")
+    parser.add_argument("--m", type=int, required=True, help="número de pacotes")
+    parser.add_argument("--n", type=int, required=True, help="número de dependências")
+    parser.add_argument("--avg-degree", type=float, default=8.0, help="média de deps por pacote")
+    parser.add_argument("--density", type=float, default=None,
+                        help="fração de deps por pacote (substitui --avg-degree: média = density * n)")
+    parser.add_argument("--degree", choices=["uniform", "powerlaw"], default="uniform")
+    parser.add_argument("--c-range", type=int, nargs=2, default=(35, 520))
+    parser.add_argument("--a-range", type=int, nargs=2, default=(50, 330))
+    parser.add_argument("--tightness", type=float, default=0.75, help="b = tightness * sum(a)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    avg = args.avg_degree if args.density is None else args.density * args.n
+    m, n, ne, b = generate_instance(args.out, args.m, args.n, avg, args.degree, tuple(args.c_range),
+                                    tuple(args.a_range), args.tightness, args.seed)
+    print(f"{args.out}: m={m}, n={n}, ne={ne}, b={b}")
@@ -0,0 +1,137 @@
+import random
+from typing import List, Tuple
+
+from constructive import constructive_grasp
+from local_search import local_search_first_improvement
+from solution_state import make_state
+
+# ---------- GRASP com pool de elite + path relinking (maximização) ----------
+# Cada iteração: construção GRASP -> busca local (first improvement) -> path
+# relinking entre o novo ótimo local e um membro do pool de elite (nos dois
+# sentidos). O pool guarda as K melhores soluções que diferem entre si em pelo
+# menos min_distance pacotes (distância de Hamming), em vez de só a melhor.
+
+
+class ElitePool:
+    """Até size soluções (valor, pacotes), todas a distância >= min_distance entre si."""
+
+    def __init__(self, size: int, min_distance: int):
+        self.size = size
+        self.min_distance = min_distance
+        self.members: List[Tuple[int, frozenset]] = []
+
+    def __len__(self):
+        return len(self.members)
+
+    def best(self):
+        return max(self.members, key=lambda e: e[0]) if self.members else (0, frozenset())
+
+    def add(self, value: int, selected) -> bool:
+        """Tenta inserir; devolve True se a solução entrou no pool."""
+        sol = frozenset(selected)
+        if any(sol == s for _, s in self.members):
+            return False
+        dists = [len(sol ^ s) for _, s in self.members]
+        best_value = self.best()[0]
+        if len(self.members) < self.size:
+            # pool incompleto: entra se for diversa (ou melhor que todas)
+            if value > best_value or all(d >= self.min_distance for d in dists):
+                self.members.append((value, sol))
+                return True
+            return False
+        worst = min(range(len(self.members)), key=lambda k: self.members[k][0])
+        if value <= self.members[worst][0]:
+            return False
+        if value <= best_value and any(d < self.min_distance for d in dists):
+            return False
+        # substitui o mais parecido entre os piores que ela (mantém a diversidade)
+        worse = [k for k in range(len(self.members)) if self.members[k][0] < value]
+        k = min(worse, key=lambda k: dists[k])
+        self.members[k] = (value, sol)
+        return True
+
+
+def path_relinking(m, b, c, a, pkg_deps, source, target, budget=None):
+    """
+    Caminha de source até target trocando um pacote da diferença por passo,
+    sempre pelo melhor movimento viável (remover do que só source tem,
+    adicionar do que só target tem). Avaliação incremental pelo SolutionState.
+    Devolve (valor, pacotes) da melhor solução intermediária, ou None se o
+    caminho tem menos de 2 passos (não há intermediárias).
+    """
+    state = make_state(c, a, pkg_deps, source)
+    to_add = set(target) - state.selected
+    to_remove = state.selected - set(target)
+    best = None
+    while len(to_add) + len(to_remove) > 1:
+        move, move_val = None, None
+        for p in to_add:
+            if state.weight + state.delta_add(p) <= b and (move_val is None or c[p] > move_val):
+                move, move_val = (None, p), c[p]
+        if move is None or move_val <= 0:
+            # nenhuma adição viável (ou útil): remove o de menor benefício
+            for p in to_remove:
+                if move_val is None or -c[p] > move_val:
+                    move, move_val = (p, None), -c[p]
+        if budget is not None and budget.spend(len(to_add) + len(to_remove)):
+            break
+        p_out, p_in = move
+        state.apply(p_out, p_in)
+        if p_out is not None:
+            to_remove.discard(p_out)
+        if p_in is not None:
+            to_add.discard(p_in)
+        if best is None or state.value > best[0]:
+            best = (state.value, set(state.selected))
+    return best
+
+
+# stats (opcional, ver instrumentation.py): iterações, relinks, entradas no pool
+# cache (opcional, ver zobrist.py): ótimos locais já calculados; construções e
+# pontos de relinking repetidos pulam a busca local inteira
+def grasp_path_relinking(m, b, c, a, pkg_deps, iters=100, rcl_size=8, elite_size=10,
+                         min_distance=None, seed=123, budget=None, stats=None, cache=None):
+    """
+    Devolve (melhor valor, pacotes). min_distance=None usa max(2, m // 50).
+    """
+    rng = random.Random(seed)
+    if min_distance is None:
+        min_distance = max(2, m // 50)
+    pool = ElitePool(elite_size, min_distance)
+    if stats is not None:
+        stats.start("grasp_pr")
+
+    for _ in range(iters):
+        if budget is not None and budget.exhausted():
+            break
+        _, pkgs = constructive_grasp(m, b, c, a, pkg_deps, iters=1, rcl_size=rcl_size,
+                                     seed=rng.getrandbits(32), budget=budget)
+        local = local_search_first_improvement(m, b, c, a, pkg_deps, pkgs, budget=budget, cache=cache)
+        val = sum(c[p] for p in local)
+        candidates = [(val, local)]
+
+        if pool.members:
+            _, guide = rng.choice(pool.members)
+            # relinking nos dois sentidos; a melhor intermediária passa pela busca local
+            for src, dst in ((local, guide), (guide, local)):
+                found = path_relinking(m, b, c, a, pkg_deps, src, dst, budget)
+                if found is None:
+                    continue
+                refined = local_search_first_improvement(m, b, c, a, pkg_deps, found[1], budget=budget,
+                                                         cache=cache)
+                candidates.append((sum(c[p] for p in refined), refined))
+            if stats is not None:
+                stats.count("relinks")
+
+        for v, sol in candidates:
+            if pool.add(v, sol) and stats is not None:
+                stats.count("pool_inserts")
+            if budget is not None:
+                budget.record(v)
+        if stats is not None:
+            stats.count("iterations")
+
+    if stats is not None:
+        stats.stop("grasp_pr")
+    value, best = pool.best()
+    return value, set(best)
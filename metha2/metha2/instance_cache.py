@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# Leitura rápida das instâncias prob-software:
+#  - parser em bloco: o corpo do arquivo vira um array de inteiros numa única
+#    chamada (np.fromstring com sep, em C); arestas já ordenadas (o caso das
+#    prob-software) não são reordenadas
+#  - cache compilado em disco (.npy por campo), identificado por hash do
+#    arquivo + mtime; execuções repetidas pulam o parse. Cada arquivo é escrito
+#    em um temporário e trocado com os.replace, então processos em paralelo
+#    (batch_runner) nunca leem um .npy/meta.json pela metade.
+# Os arrays CSR (indptr, indices) seguem para quem sabe usá-los: bounds.py e,
+# via read_instance(bitset=True), BitsetDeps.csr (ver constructive_batch.incidence_csr).
+
+CACHE_DIR = ".instance_cache"
+
+
+def parse_instance_arrays(path: str):
+    """
+    Lê o arquivo e devolve (m, n, ne, b, c, a, indptr, indices), com as
+    dependências em CSR: deps do pacote p = indices[indptr[p]:indptr[p+1]].
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        m, n, ne, b = map(int, f.readline().split())
+        body = np.fromstring(f.read(), dtype=np.int64, sep=" ")
+    c = body[:m]
+    a = body[m:m + n]
+    edges = body[m + n:m + n + 2 * ne]
+    # chave pacote * n + dep: ordena por (pacote, dep) só se preciso e remove repetidas
+    keys = edges[0::2] * n + edges[1::2]
+    if len(keys) > 1 and not (keys[1:] > keys[:-1]).all():
+        keys = np.sort(keys)
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    indptr = np.zeros(m + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // n, minlength=m), out=indptr[1:])
+    return m, n, ne, b, c.copy(), a.copy(), indptr, keys % n
+
+
+def _write_atomic(path: str, write) -> None:
+    """
+    Escreve em um arquivo temporário na mesma pasta e troca com os.replace:
+    quem lê (ex.: outro worker do batch_runner) vê o arquivo antigo ou o novo
+    inteiro, nunca um arquivo pela metade.
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _write_json(path: str, obj) -> None:
+    _write_atomic(path, lambda f: f.write(json.dumps(obj).encode("utf-8")))
+
+
+def _file_sha1(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        h.update(f.read())
+    return h.hexdigest()
+
+
+def _cache_location(path: str, cache_dir: str | None) -> str:
+    base = cache_dir if cache_dir is not None else os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR)
+    return os.path.join(base, os.path.basename(path))
+
+
+def load_instance_arrays(path: str, use_cache: bool = True, cache_dir: str | None = None):
+    """
+    Igual a parse_instance_arrays, mas usando/atualizando o cache em disco.
+    """
+    if not use_cache:
+        return parse_instance_arrays(path)
+
+    where = _cache_location(path, cache_dir)
+    meta_path = os.path.join(where, "meta.json")
+    st = os.stat(path)
+
+    meta = None
+    if os.path.exists(meta_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+    valid = False
+    if meta is not None:
+        if meta["mtime_ns"] == st.st_mtime_ns and meta["size"] == st.st_size:
+            valid = True
+        elif meta["size"] == st.st_size and meta["sha1"] == _file_sha1(path):
+            # conteúdo igual, só o mtime mudou (ex.: checkout): atualiza o meta
+            meta["mtime_ns"] = st.st_mtime_ns
+            _write_json(meta_path, meta)
+            valid = True
+
+    if valid:
+        arrays = {k: np.load(os.path.join(where, k + ".npy"))
+                  for k in ("c", "a", "indptr", "indices")}
+        return (meta["m"], meta["n"], meta["ne"], meta["b"],
+                arrays["c"], arrays["a"], arrays["indptr"], arrays["indices"])
+
+    m, n, ne, b, c, a, indptr, indices = parse_instance_arrays(path)
+    os.makedirs(where, exist_ok=True)
+    for k, arr in (("c", c), ("a", a), ("indptr", indptr), ("indices", indices)):
+        _write_atomic(os.path.join(where, k + ".npy"), lambda f, arr=arr: np.save(f, arr))
+    meta = {"m": m, "n": n, "ne": ne, "b": b,
+            "sha1": _file_sha1(path), "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+    # meta por último: se a escrita for interrompida o cache fica inválido
+    _write_json(meta_path, meta)
+    return m, n, ne, b, c, a, indptr, indices
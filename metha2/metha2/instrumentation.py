@@ -0,0 +1,44 @@
+import time
+from collections import Counter
+
+
+class SolverStats:
+    """
+    Instrumentação opcional dos solvers (SA, cálculo de T0, busca local).
+    Os solvers recebem stats=None por padrão e só tocam neste objeto quando
+    ele é passado, então desligado o custo é um "is not None" por passo.
+
+    Coleta:
+      - phases: tempo acumulado por fase (ex.: "sa_T0", "sa", "ls_flip", "ls_swap")
+      - counters: contadores globais (avaliações, tentativas inviáveis, flip/swap...)
+      - levels: um registro por nível de temperatura (SA e cálculo de T0)
+    """
+
+    def __init__(self):
+        self.phases = Counter()
+        self.counters = Counter()
+        self.levels = []
+        self._open = {}
+
+    # ---------- fases ----------
+    def start(self, phase: str) -> None:
+        self._open[phase] = time.perf_counter()
+
+    def stop(self, phase: str) -> None:
+        self.phases[phase] += time.perf_counter() - self._open.pop(phase)
+
+    # ---------- contadores ----------
+    def count(self, name: str, k: int = 1) -> None:
+        self.counters[name] += k
+
+    def level(self, **fields) -> None:
+        self.levels.append(fields)
+
+    # ---------- exportação ----------
+    def to_record(self) -> dict:
+        """Registro estruturado (serializável em JSON) para gravar junto do resultado."""
+        return {
+            "phases": {k: round(v, 6) for k, v in self.phases.items()},
+            "counters": dict(self.counters),
+            "levels": self.levels,
+        }
@@ -1,5 +1,6 @@
-from typing import List, Set, Tuple
-from utils import solution_value, solution_weight
+from solution_state import make_state
+from swap_neighbourhood import SwapNeighbourhood
+from flip_neighbourhood import FlipNeighbourhood
 
 ##ATIVIDADE 2 - BUSCA LOCAL -----------------------------------
 
@@ -25,116 +26,177 @@ def delta_cost_swap(p_out, p_in, selected, pkg_deps, a):
     # delta total no peso
     return add_cost - remove_credit
 
+# melhor movimento SWAP a partir do estado: devolve (p_out, p_in) ou None
+# (ver swap_neighbourhood.py: candidatos por valor e filtro de viabilidade)
+def _best_swap_move(m, b, state, budget=None):
+    return SwapNeighbourhood(m, b, state).best_move(budget)
+
 #examinar vizinhanca flip e swap, escolhendo a melhor melhoria
 def improve_by_flip_best(m, b, c, a, pkg_deps, current):
-    best = current
-    best_val = solution_value(current, c)
-    current_deps = deps_of_solution(current, pkg_deps)
-    current_w = sum(a[d] for d in current_deps)
-
-    # tenta remover (sempre viável)
-    for p in list(current):
-        cand = set(current); cand.remove(p)
-        val = solution_value(cand, c)
-        if val > best_val and solution_weight(cand, pkg_deps, a) <= b:
-            best, best_val = cand, val
-
-    # tenta adicionar
-    for p in range(m):
-        if p in current: continue
-        cost = sum(a[d] for d in (pkg_deps[p] - current_deps))
-        if current_w + cost <= b:
-            cand = set(current); cand.add(p)
-            val = solution_value(cand, c)
-            if val > best_val:
-                best, best_val = cand, val
-
-    return best, (best != current)
+    state = make_state(c, a, pkg_deps, current)
+    move = FlipNeighbourhood(m, b, state).best_move()
+    if move is None:
+        return current, False
+    state.apply(*move)
+    return state.selected, True
 
 def improve_by_swap_best(m, b, c, a, pkg_deps, current):
-    best = current
-    best_val = solution_value(current, c)
-    # percorre pares (p_out in current, p_in not in current)
-    for p_out in list(current):
-        for p_in in range(m):
-            if p_in in current: continue
-            delta = delta_cost_swap(p_out, p_in, current, pkg_deps, a)
-            # checa capacidade
-            if solution_weight(current, pkg_deps, a) + delta <= b:
-                cand = set(current)
-                cand.remove(p_out); cand.add(p_in)
-                val = solution_value(cand, c)
-                if val > best_val:
-                    best, best_val = cand, val
-    return best, (best != current)
+    state = make_state(c, a, pkg_deps, current)
+    move = _best_swap_move(m, b, state)
+    if move is None:
+        return current, False
+    state.apply(*move)
+    return state.selected, True
+
+# cache (opcional, ver zobrist.py): ótimo local já calculado para a mesma solução
+# de partida (ex.: construções GRASP repetidas); só grava buscas que terminaram
+def _cached_optimum(cache, tag, state, budget):
+    if cache is None:
+        return None
+    hit = cache.get(tag, state.hash)
+    if hit is not None and budget is not None:
+        budget.record(hit[0])
+    return hit
+
+def _store_optimum(cache, tag, start_hash, state, budget):
+    if cache is not None and (budget is None or not budget.exhausted()):
+        cache.put(tag, start_hash, (state.value, state.weight, frozenset(state.selected)))
 
 #aplica busca local com vizinhança flip e swap, até ótimo local
-def local_search_best_improvement(m, b, c, a, pkg_deps, initial_solution):
-    current = set(initial_solution)
-    while True:
-        # tenta FLIP
-        cand, changed = improve_by_flip_best(m, b, c, a, pkg_deps, current)
-        if changed:
-            current = cand
-            continue
-        # tenta SWAP
-        cand, changed = improve_by_swap_best(m, b, c, a, pkg_deps, current)
-        if changed:
-            current = cand
+# stats (opcional, ver instrumentation.py): tempo por vizinhança, varreduras e movimentos
+def local_search_best_improvement(m, b, c, a, pkg_deps, initial_solution, budget=None, stats=None,
+                                  cache=None):
+    state = make_state(c, a, pkg_deps, initial_solution, cache.keys if cache is not None else None)
+    hit = _cached_optimum(cache, "ls_best", state, budget)
+    if hit is not None:
+        return set(hit[2])
+    start_hash = state.hash
+    swaps = SwapNeighbourhood(m, b, state)
+    flips = FlipNeighbourhood(m, b, state)
+    if budget is not None:
+        budget.record(state.value)
+    while budget is None or not budget.exhausted():
+        # tenta FLIP (vetorizado, ver flip_neighbourhood.py)
+        if stats is not None:
+            stats.start("ls_flip")
+        move = flips.best_move(budget)
+        if stats is not None:
+            stats.stop("ls_flip")
+            stats.count("flip_scans")
+            stats.count("flip_evaluated", m)
+        if move is None:
+            # tenta SWAP
+            if stats is not None:
+                stats.start("ls_swap")
+            evaluated, pruned = swaps.evaluated, swaps.pruned
+            move = swaps.best_move(budget)
+            if stats is not None:
+                stats.stop("ls_swap")
+                stats.count("swap_scans")
+                stats.count("swap_evaluated", swaps.evaluated - evaluated)
+                stats.count("swap_pruned", swaps.pruned - pruned)
+        if move is not None:
+            state.apply(*move)
+            flips.moved(*move)
+            if stats is not None:
+                stats.count("swap_moves" if None not in move else "flip_moves")
+            if budget is not None:
+                budget.record(state.value)
             continue
         # sem melhora em nenhuma vizinhança → ótimo local
         break
-    return current
-
-def local_search_first_improvement(m, b, c, a, pkg_deps, initial_solution):
-    current = set(initial_solution)
+    _store_optimum(cache, "ls_best", start_hash, state, budget)
+    return state.selected
+
+# Os p_out do SWAP são percorridos na ordem de iteração de state.selected, um set
+# alterado no lugar; a versão antiga copiava o conjunto a cada movimento, e a ordem
+# de iteração de um set depende do histórico de inserções. Com a mesma solução de
+# partida o primeiro swap de melhora pode ser outro e o ótimo local mudar (em
+# prob-software.txt, 3 de 10 partidas GRASP: 10875 -> 11004, 11118 -> 10689,
+# 11378 -> 11351); continua sendo um ótimo local das mesmas vizinhanças.
+def local_search_first_improvement(m, b, c, a, pkg_deps, initial_solution, budget=None, stats=None,
+                                   cache=None):
+    state = make_state(c, a, pkg_deps, initial_solution, cache.keys if cache is not None else None)
+    hit = _cached_optimum(cache, "ls_first", state, budget)
+    if hit is not None:
+        return set(hit[2])
+    start_hash = state.hash
+    selected = state.selected
+    swaps = SwapNeighbourhood(m, b, state)
+    if budget is not None:
+        budget.record(state.value)
 
     while True:
-        current_val = solution_value(current, c)
-        current_w   = solution_weight(current, pkg_deps, a)
-
         improved = False
+        out_of_budget = False
 
         # --- FLIP ---
+        if stats is not None:
+            stats.start("ls_flip")
+            stats.count("flip_scans")
+        old_weight = state.weight
         for p in range(m):
-            cand = set(current)
-            if p in cand:
-                cand.remove(p)
+            if p in selected:
+                # remover é sempre viável; melhora só se c[p] < 0
+                if c[p] < 0:
+                    state.remove(p)
+                    swaps.moved(p, None, old_weight)
+                    improved = True
+                    break
             else:
-                deps_now = deps_of_solution(cand, pkg_deps)
-                cost = sum(a[d] for d in (pkg_deps[p] - deps_now))
-                if current_w + cost > b:
+                if budget is not None and budget.spend():
+                    out_of_budget = True
+                    break
+                if state.weight + state.delta_add(p) > b:
                     continue
-                cand.add(p)
+                if c[p] > 0:
+                    state.add(p)
+                    swaps.moved(None, p, old_weight)
+                    improved = True
+                    break   # aceita a primeira melhora
 
-            val = solution_value(cand, c)
-            if val > current_val and solution_weight(cand, pkg_deps, a) <= b:
-                current = cand
-                improved = True
-                break   # aceita a primeira melhora
+        if stats is not None:
+            stats.stop("ls_flip")
+            stats.count("flip_evaluated", p + 1 if m else 0)
 
         if improved:
+            if stats is not None:
+                stats.count("flip_moves")
+            if budget is not None:
+                budget.record(state.value)
             continue  # volta para while com nova solução
+        if out_of_budget:
+            break
 
         # --- SWAP ---
-        for p_out in list(current):
-            for p_in in range(m):
-                if p_in in current:
-                    continue
-                delta = delta_cost_swap(p_out, p_in, current, pkg_deps, a)
-                if current_w + delta <= b:
-                    cand = set(current)
-                    cand.remove(p_out)
-                    cand.add(p_in)
-                    val = solution_value(cand, c)
-                    if val > current_val:
-                        current = cand
-                        improved = True
-                        break
+        if stats is not None:
+            stats.start("ls_swap")
+            stats.count("swap_scans")
+        # (don't-look bits e candidatos: ver swap_neighbourhood.py)
+        evaluated, pruned, skipped = swaps.evaluated, swaps.pruned, swaps.skipped
+        old_weight = state.weight
+        move = swaps.first_move(budget)
+        if move == "budget":
+            out_of_budget = True
+        elif move is not None:
+            state.apply(*move)
+            swaps.moved(*move, old_weight)
+            improved = True
+
+        if stats is not None:
+            stats.stop("ls_swap")
+            stats.count("swap_evaluated", swaps.evaluated - evaluated)
+            stats.count("swap_pruned", swaps.pruned - pruned)
+            stats.count("swap_dont_look", swaps.skipped - skipped)
             if improved:
-                break
+                stats.count("swap_moves")
+        if improved and budget is not None:
+            budget.record(state.value)
+        if out_of_budget:
+            break
 
         if not improved:
             break  # nenhum vizinho melhora → ótimo local
 
-    return current
+    _store_optimum(cache, "ls_first", start_hash, state, budget)
+    return selected
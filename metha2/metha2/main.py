@@ -1,40 +1,49 @@
 import random, time
 from utils import log_execution, read_instance, solution_weight, solution_value
-from constructive import constructive_random, constructive_greedy, constructive_grasp
+from constructive import constructive_greedy_lazy
+from constructive_batch import constructive_grasp_batch, constructive_random_batch
 from local_search import local_search_best_improvement, local_search_first_improvement
 from meta_sa import simulated_annealing
+from meta_tabu import tabu_search
+from bounds import upper_bound
 
 if __name__ == "__main__":
     path = "prob-software2.txt"
     #teste
 
-    m, n, ne, b, c, a, pkg_deps = read_instance(path)
+    usar_bitset = True  # deps em bitset (mais rápido nas instâncias grandes); False = sets
+    m, n, ne, b, c, a, pkg_deps = read_instance(path, bitset=usar_bitset)
     print(f"Lido: m={m}, n={n}, ne={ne}, b={b}, instância: {path}" )
 
+    # limitante superior (cacheado por instância, ver bounds.py): cada linha do log leva o gap
+    ub = upper_bound(path)
+    print(f"Limitante superior: {ub}")
+
     run_id = 3  ################################## incrementar para mudar id individualmente de cada execução
 
     # RANDOM
     start = time.time()
-    val_rnd, pkgs_rnd = constructive_random(m, b, c, a, pkg_deps, restarts=200, seed=None)
+    # construções em lote (constructive_batch.py): mesmas regras do constructive_random/_grasp
+    val_rnd, pkgs_rnd = constructive_random_batch(m, b, c, a, pkg_deps, restarts=200, seed=None)
     elapsed = time.time() - start
     wt_rnd = solution_weight(pkgs_rnd, pkg_deps, a)
-    log_execution(run_id, "RANDOM", val_rnd, wt_rnd, len(pkgs_rnd), b, elapsed)
+    log_execution(run_id, "RANDOM", val_rnd, wt_rnd, len(pkgs_rnd), b, elapsed, upper_bound=ub)
     print(f"Random: valor {val_rnd}, peso {wt_rnd}/{b}, pacotes {len(pkgs_rnd)}, tempo {elapsed:.4f}s")
 
     # GREEDY
     start = time.time()
-    val_gre, pkgs_gre = constructive_greedy(m, b, c, a, pkg_deps)
+    val_gre, pkgs_gre = constructive_greedy_lazy(m, b, c, a, pkg_deps)  # mesma solução do constructive_greedy
     elapsed = time.time() - start
     wt_gre = solution_weight(pkgs_gre, pkg_deps, a)
-    log_execution(run_id, "GREEDY", val_gre, wt_gre, len(pkgs_gre), b, elapsed)
+    log_execution(run_id, "GREEDY", val_gre, wt_gre, len(pkgs_gre), b, elapsed, upper_bound=ub)
     print(f"Greedy: valor {val_gre}, peso {wt_gre}/{b}, pacotes {len(pkgs_gre)}, tempo {elapsed:.4f}s")
 
     # GRASP
     start = time.time()
-    val_grasp, pkgs_grasp = constructive_grasp(m, b, c, a, pkg_deps, iters=200, rcl_size=8, seed=None)
+    val_grasp, pkgs_grasp = constructive_grasp_batch(m, b, c, a, pkg_deps, iters=200, rcl_size=8, seed=None)
     elapsed = time.time() - start
     wt_grasp = solution_weight(pkgs_grasp, pkg_deps, a)
-    log_execution(run_id, "GRASP", val_grasp, wt_grasp, len(pkgs_grasp), b, elapsed)
+    log_execution(run_id, "GRASP", val_grasp, wt_grasp, len(pkgs_grasp), b, elapsed, upper_bound=ub)
     print(f"GRASP: valor {val_grasp}, peso {wt_grasp}/{b}, pacotes {len(pkgs_grasp)}, tempo {elapsed:.4f}s")
 
     # ATIVIDADE 2 - BUSCA LOCAL ------------------------------
@@ -44,7 +53,7 @@ if __name__ == "__main__":
     elapsed = time.time() - start
     val_refined = solution_value(refined, c)
     wt_refined = solution_weight(refined, pkg_deps, a)
-    log_execution(run_id, "LOCAL_BEST", val_refined, wt_refined, len(refined), b, elapsed)
+    log_execution(run_id, "LOCAL_BEST", val_refined, wt_refined, len(refined), b, elapsed, upper_bound=ub)
     print(
         f"Local Search (Best): valor {val_refined}, peso {wt_refined}/{b}, pacotes {len(refined)}, tempo {elapsed:.4f}s")
 
@@ -53,7 +62,7 @@ if __name__ == "__main__":
     elapsed = time.time() - start
     val_refined = solution_value(refined, c)
     wt_refined = solution_weight(refined, pkg_deps, a)
-    log_execution(run_id, "LOCAL_FIRST", val_refined, wt_refined, len(refined), b, elapsed)
+    log_execution(run_id, "LOCAL_FIRST", val_refined, wt_refined, len(refined), b, elapsed, upper_bound=ub)
     print(
         f"Local Search (First): valor {val_refined}, peso {wt_refined}/{b}, pacotes {len(refined)}, tempo {elapsed:.4f}s")
 
@@ -72,7 +81,7 @@ if __name__ == "__main__":
     )
     elapsed = time.time() - start
     wt = solution_weight(pkgs_sa_fast, pkg_deps, a)
-    log_execution(run_id, "SA_FAST", val_sa_fast, wt, len(pkgs_sa_fast), b, elapsed)
+    log_execution(run_id, "SA_FAST", val_sa_fast, wt, len(pkgs_sa_fast), b, elapsed, upper_bound=ub)
     print(f"[SA-FAST] valor={val_sa_fast} peso={wt}/{b} pacotes={len(pkgs_sa_fast)} tempo={elapsed:.4f}s")
 
     # --- SA-QUALITY (tentativa com parametros mais rigidos)
@@ -87,7 +96,22 @@ if __name__ == "__main__":
     )
     elapsed = time.time() - start
     wt = solution_weight(pkgs_sa_q, pkg_deps, a)
-    log_execution(run_id, "SA_QUALITY", val_sa_q, wt, len(pkgs_sa_q), b, elapsed)
+    log_execution(run_id, "SA_QUALITY", val_sa_q, wt, len(pkgs_sa_q), b, elapsed, upper_bound=ub)
     print(f"[SA-QUALITY] valor={val_sa_q} peso={wt}/{b} pacotes={len(pkgs_sa_q)} tempo={elapsed:.4f}s")
 
+    # -------------------------------------------------
+    # META-HEURÍSTICA 3: BUSCA TABU
+    # -------------------------------------------------
+    start = time.time()
+    val_tabu, pkgs_tabu = tabu_search(
+        m, b, c, a, pkg_deps, pkgs_grasp,
+        max_iters=2000,  # limite de iterações
+        tenure=None,  # None => max(7, m // 30) + sorteio
+        max_no_improve=300  # para após 300 iterações sem melhorar a melhor
+    )
+    elapsed = time.time() - start
+    wt = solution_weight(pkgs_tabu, pkg_deps, a)
+    log_execution(run_id, "TABU", val_tabu, wt, len(pkgs_tabu), b, elapsed, upper_bound=ub)
+    print(f"[TABU] valor={val_tabu} peso={wt}/{b} pacotes={len(pkgs_tabu)} tempo={elapsed:.4f}s")
+
     print("\nExecução concluída e salva em resultados.txt")
@@ -1,31 +1,48 @@
 import random, time
 from utils import read_instance, solution_value, log_experiment_detail, \
 deps_of_solution, binaries_from_solution
-from constructive import constructive_grasp
+from constructive_batch import constructive_grasp_batch
 from local_search import local_search_first_improvement
 from meta_sa import simulated_annealing
+from meta_tabu import tabu_search
+from parallel_grasp import parallel_grasp_ls
+from grasp_pr import grasp_path_relinking
+from meta_pt import parallel_tempering
+from results_store import ResultsStore, record_from_solution
+from bounds import upper_bound
+from budget import Budget
+from zobrist import EvalCache
 
 
 if __name__ == "__main__":
     path = "prob-software9.txt"
     #prob-software8 ,prob-software9, prob-software10 instancias da maratona (2,7,28 respectivamente)
-    m, n, ne, b, c, a, pkg_deps = read_instance(path)
+    usar_bitset = True  # deps em bitset (mais rápido nas instâncias grandes); False = sets
+    m, n, ne, b, c, a, pkg_deps = read_instance(path, bitset=usar_bitset)
     print(f"Lido: m={m}, n={n}, ne={ne}, b={b}, instância: {path}")
 
+    # limitante superior (cacheado por instância, ver bounds.py): vai para o log como gap,
+    # e LS/SA/Tabu recebem Budget(target=ub) para parar se a solução atingir o limitante
+    ub = upper_bound(path)
+    print(f"Limitante superior: {ub}")
+
     #=====Seeds=====
     run_seed = int(time.time())  # semente baseada no relógio
     #run_seed = 1760711790 # semente definida
     random.seed(run_seed)
 
+    # resultados também vão para o armazenamento estruturado (ver results_store.py)
+    store = ResultsStore("resultados.db")
+
     # ========== META 1: GRASP + Local Search (First fit) ==========
     # GRASP
     start = time.time()
-    val_grasp, pkgs_grasp = constructive_grasp(m, b, c, a, pkg_deps, iters=200, rcl_size=8, seed=run_seed)
+    val_grasp, pkgs_grasp = constructive_grasp_batch(m, b, c, a, pkg_deps, iters=200, rcl_size=8, seed=run_seed)
     t_grasp = time.time() - start
 
     # Local Search (First)
     start = time.time()
-    pkgs_ls = local_search_first_improvement(m, b, c, a, pkg_deps, pkgs_grasp)
+    pkgs_ls = local_search_first_improvement(m, b, c, a, pkg_deps, pkgs_grasp, budget=Budget(target=ub))
     t_ls = time.time() - start
 
     val_ls = solution_value(pkgs_ls, c)
@@ -47,10 +64,77 @@ if __name__ == "__main__":
                           deps_str=deps_str,
                           params_dict=params_grasp_ls,
                           seed=run_seed,
-                          elapsed_seconds=(t_grasp + t_ls))
+                          elapsed_seconds=(t_grasp + t_ls),
+                          upper_bound=ub)
+    store.add(record_from_solution(path, "GRASP+LS_FIRST", run_seed, pkgs_ls, pkg_deps, c, a, b,
+                                   params_grasp_ls, (t_grasp + t_ls), ub))
 
     print(f"Local Search (First): valor {val_ls}, peso {wt_ls}/{b}, pacotes {len(pkgs_ls)}, tempo {(t_grasp+t_ls):.4f}s")
 
+    # ========== META 1b (opcional): GRASP multi-start + LS em paralelo ==========
+    usar_paralelo = False  # True: LS em cada construção, espalhado em todos os núcleos
+    if usar_paralelo:
+        start = time.time()
+        val_par, pkgs_par = parallel_grasp_ls(m, b, c, a, pkg_deps, iters=200, rcl_size=8,
+                                              seed=run_seed, workers=None, budget=Budget(target=ub))
+        t_par = time.time() - start
+
+        deps_par = deps_of_solution(pkgs_par, pkg_deps)
+        wt_par = sum(a[d] for d in deps_par)
+        pkgs_str, deps_str = binaries_from_solution(pkgs_par, m, deps_par, n)
+        params_par = {
+            "grasp_iters": 200,
+            "grasp_rcl_size": 8,
+            "local_search": "first_improvement",
+            "workers": "cpu_count",
+            "seed": run_seed
+        }
+        log_experiment_detail("experimentos.txt", path, "GRASP+LS_FIRST_PAR",
+                              best_value=val_par,
+                              total_weight=wt_par,
+                              pkgs_str=pkgs_str,
+                              deps_str=deps_str,
+                              params_dict=params_par,
+                              seed=run_seed,
+                              elapsed_seconds=t_par,
+                              upper_bound=ub)
+        store.add(record_from_solution(path, "GRASP+LS_FIRST_PAR", run_seed, pkgs_par, pkg_deps, c, a, b,
+                                       params_par, t_par, ub))
+
+        print(f"GRASP+LS paralelo: valor {val_par}, peso {wt_par}/{b}, pacotes {len(pkgs_par)}, tempo {t_par:.4f}s")
+
+    # ========== META 1c (opcional): GRASP com pool de elite + path relinking ==========
+    usar_pr = False  # True: guarda as melhores soluções diversas e faz relinking entre elas
+    if usar_pr:
+        pr_params = {
+            "iters": 100,
+            "rcl_size": 8,
+            "elite_size": 10,
+            "min_distance": None
+        }
+        start = time.time()
+        # cache de ótimos locais: construções/relinkings repetidos pulam a busca local
+        val_pr, pkgs_pr = grasp_path_relinking(m, b, c, a, pkg_deps, seed=run_seed,
+                                               budget=Budget(target=ub), cache=EvalCache(m), **pr_params)
+        t_pr = time.time() - start
+
+        deps_pr = deps_of_solution(pkgs_pr, pkg_deps)
+        wt_pr = sum(a[d] for d in deps_pr)
+        pkgs_str, deps_str = binaries_from_solution(pkgs_pr, m, deps_pr, n)
+        log_experiment_detail("experimentos.txt", path, "GRASP+PR",
+                              best_value=val_pr,
+                              total_weight=wt_pr,
+                              pkgs_str=pkgs_str,
+                              deps_str=deps_str,
+                              params_dict=pr_params,
+                              seed=run_seed,
+                              elapsed_seconds=t_pr,
+                              upper_bound=ub)
+        store.add(record_from_solution(path, "GRASP+PR", run_seed, pkgs_pr, pkg_deps, c, a, b,
+                                       pr_params, t_pr, ub))
+
+        print(f"GRASP+PR: valor {val_pr}, peso {wt_pr}/{b}, pacotes {len(pkgs_pr)}, tempo {t_pr:.4f}s")
+
     # ========== META 2: Simulated Annealing (preset FAST)
     sa_params = {
         "T0": 90,
@@ -66,7 +150,8 @@ if __name__ == "__main__":
                                           SAmax=sa_params["SAmax"],
                                           Tfinal=sa_params["Tfinal"],
                                           max_neighbor_trials=sa_params["max_neighbor_trials"],
-                                          seed=run_seed)
+                                          seed=run_seed,
+                                          budget=Budget(target=ub))
     t_sa = time.time() - start
 
     deps_sa = deps_of_solution(pkgs_sa, pkg_deps)
@@ -80,8 +165,82 @@ if __name__ == "__main__":
                           deps_str=deps_str,
                           params_dict=sa_params,
                           seed=run_seed,
-                          elapsed_seconds=t_sa)
+                          elapsed_seconds=t_sa,
+                          upper_bound=ub)
+    store.add(record_from_solution(path, "SA_FAST", run_seed, pkgs_sa, pkg_deps, c, a, b,
+                                   sa_params, t_sa, ub))
 
     print(f"[SA-FAST] valor={val_sa} peso={wt_sa}/{b} pacotes={len(pkgs_sa)} tempo={t_sa:.4f}s")
 
-    print("\nExecução concluída e salva em experimentos.txt")
+    # ========== META 2b (opcional): Parallel Tempering (uma réplica por processo)
+    usar_pt = False
+    if usar_pt:
+        pt_params = {
+            "T_min": 10.0,
+            "T_max": 200.0,
+            "n_replicas": 8,
+            "sweeps": 150,
+            "steps_per_sweep": 120,
+            "max_neighbor_trials": 10
+        }
+        start = time.time()
+        val_pt, pkgs_pt, pt_stats = parallel_tempering(m, b, c, a, pkg_deps, pkgs_grasp,
+                                                       seed=run_seed, budget=Budget(target=ub),
+                                                       **pt_params)
+        t_pt = time.time() - start
+
+        deps_pt = deps_of_solution(pkgs_pt, pkg_deps)
+        wt_pt = sum(a[d] for d in deps_pt)
+        pkgs_str, deps_str = binaries_from_solution(pkgs_pt, m, deps_pt, n)
+
+        log_experiment_detail("experimentos.txt", path, "PT",
+                              best_value=val_pt,
+                              total_weight=wt_pt,
+                              pkgs_str=pkgs_str,
+                              deps_str=deps_str,
+                              params_dict=pt_params,
+                              seed=run_seed,
+                              elapsed_seconds=t_pt,
+                              upper_bound=ub)
+        store.add(record_from_solution(path, "PT", run_seed, pkgs_pt, pkg_deps, c, a, b,
+                                       pt_params, t_pt, ub))
+
+        print(f"[PT] valor={val_pt} peso={wt_pt}/{b} pacotes={len(pkgs_pt)} tempo={t_pt:.4f}s")
+        for st in pt_stats:
+            print(f"  T={st['T']:.2f} aceitação={st['acceptance']:.3f} trocas={st['swap_rate']:.2f} melhor={st['best']}")
+
+    # ========== META 3: Busca Tabu
+    tabu_params = {
+        "max_iters": 2000,
+        "tenure": None,
+        "max_no_improve": 300
+    }
+    start = time.time()
+    val_tabu, pkgs_tabu = tabu_search(m, b, c, a, pkg_deps, pkgs_grasp,
+                                      max_iters=tabu_params["max_iters"],
+                                      tenure=tabu_params["tenure"],
+                                      max_no_improve=tabu_params["max_no_improve"],
+                                      seed=run_seed,
+                                      budget=Budget(target=ub))
+    t_tabu = time.time() - start
+
+    deps_tabu = deps_of_solution(pkgs_tabu, pkg_deps)
+    wt_tabu = sum(a[d] for d in deps_tabu)
+    pkgs_str, deps_str = binaries_from_solution(pkgs_tabu, m, deps_tabu, n)
+
+    log_experiment_detail("experimentos.txt", path, "TABU",
+                          best_value=val_tabu,
+                          total_weight=wt_tabu,
+                          pkgs_str=pkgs_str,
+                          deps_str=deps_str,
+                          params_dict=tabu_params,
+                          seed=run_seed,
+                          elapsed_seconds=t_tabu,
+                          upper_bound=ub)
+    store.add(record_from_solution(path, "TABU", run_seed, pkgs_tabu, pkg_deps, c, a, b,
+                                   tabu_params, t_tabu, ub))
+
+    print(f"[TABU] valor={val_tabu} peso={wt_tabu}/{b} pacotes={len(pkgs_tabu)} tempo={t_tabu:.4f}s")
+
+    store.close()
+    print("\nExecução concluída e salva em experimentos.txt e resultados.db")
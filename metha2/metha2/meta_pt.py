@@ -0,0 +1,162 @@
+import math, random
+from multiprocessing import Pipe, Process
+
+from meta_sa import sa_propose_move, move_delta
+from parallel_grasp import iteration_seeds
+from solution_state import make_state
+
+# ---------- Parallel Tempering (replica exchange), maximização ----------
+# N réplicas em uma escada geométrica de temperaturas, cada uma em um processo.
+# A cada rodada cada réplica faz steps_per_sweep passos de Metrópolis na sua T;
+# depois vizinhos na escada tentam trocar de estado. Como cada processo guarda
+# o seu estado, a troca é feita trocando as temperaturas (mesmo efeito, sem
+# mover a solução entre processos).
+
+
+class Replica:
+    """Uma cadeia de Metrópolis com estado incremental (roda dentro do worker)."""
+
+    def __init__(self, m, b, c, a, pkg_deps, initial_solution, max_neighbor_trials, seed):
+        self.m, self.b, self.c = m, b, c
+        self.state = make_state(c, a, pkg_deps, initial_solution)
+        self.rng = random.Random(seed)
+        self.max_neighbor_trials = max_neighbor_trials
+        self.best = set(self.state.selected)
+        self.f_best = self.state.value
+
+    def run(self, T, steps):
+        """
+        Faz steps passos na temperatura T; devolve (valor atual, aceitos, melhor,
+        melhor_sol|None, melhor valor nesta rodada, ou seja, visto nesta T).
+        """
+        state, rng, c = self.state, self.rng, self.c
+        accepted = 0
+        improved = False
+        run_best = state.value
+        for _ in range(steps):
+            move = sa_propose_move(self.m, self.b, state, rng, self.max_neighbor_trials)
+            if move is None:
+                continue
+            delta = move_delta(c, move)
+            if delta > 0 or rng.random() < math.exp(delta / T):
+                state.apply(*move)
+                accepted += 1
+                run_best = max(run_best, state.value)
+                if state.value > self.f_best:
+                    self.best, self.f_best = set(state.selected), state.value
+                    improved = True
+        return state.value, accepted, self.f_best, (sorted(self.best) if improved else None), run_best
+
+
+def _replica_worker(conn, args):
+    replica = Replica(*args)
+    while True:
+        msg = conn.recv()
+        if msg is None:
+            break
+        T, steps = msg
+        conn.send(replica.run(T, steps))
+    conn.close()
+
+
+def temperature_ladder(T_min, T_max, n_replicas):
+    if n_replicas == 1:
+        return [T_min]
+    ratio = (T_max / T_min) ** (1.0 / (n_replicas - 1))
+    return [T_min * ratio ** k for k in range(n_replicas)]
+
+
+def parallel_tempering(m, b, c, a, pkg_deps, initial_solution,
+                       T_min=10.0, T_max=200.0, n_replicas=8, sweeps=150,
+                       steps_per_sweep=120, max_neighbor_trials=10, seed=None,
+                       processes=True, budget=None):
+    """
+    Devolve (f_best, best, stats). stats tem uma entrada por temperatura da escada:
+      T, acceptance (aceitos/passos), swap_rate (trocas aceitas com a T seguinte
+      / tentativas) e best (melhor valor visto por uma réplica nessa T).
+    processes=False roda as réplicas no próprio processo (mesmo resultado).
+    budget (opcional, ver budget.py): cada passo de cada réplica conta como uma
+    avaliação, como no SA; o orçamento é conferido entre as rodadas (as réplicas
+    não param no meio de uma), e f_best é registrado a cada rodada.
+    """
+    temps = temperature_ladder(T_min, T_max, n_replicas)
+    seeds = iteration_seeds(seed, n_replicas + 1)
+    rng = random.Random(seeds[-1])  # sorteio das trocas
+    init = sorted(initial_solution)
+    args = [(m, b, c, a, pkg_deps, init, max_neighbor_trials, seeds[r]) for r in range(n_replicas)]
+
+    if processes:
+        conns, procs = [], []
+        for r in range(n_replicas):
+            parent, child = Pipe()
+            p = Process(target=_replica_worker, args=(child, args[r]), daemon=True)
+            p.start()
+            conns.append(parent); procs.append(p)
+
+        def run_all(slot_temp):
+            for r, conn in enumerate(conns):
+                conn.send((slot_temp[r], steps_per_sweep))
+            return [conn.recv() for conn in conns]
+    else:
+        replicas = [Replica(*args[r]) for r in range(n_replicas)]
+
+        def run_all(slot_temp):
+            return [rep.run(slot_temp[r], steps_per_sweep) for r, rep in enumerate(replicas)]
+
+    # temp_of[r] = índice na escada da réplica r; rep_at[k] = réplica na temperatura k
+    temp_of = list(range(n_replicas))
+    accepted = [0] * n_replicas
+    swaps_ok = [0] * n_replicas
+    swaps_try = [0] * n_replicas
+    best_at = [sum(c[p] for p in init)] * n_replicas
+    f_best, best = best_at[0], set(init)
+    if budget is not None:
+        budget.record(f_best)
+    done = 0
+
+    try:
+        for sweep in range(sweeps):
+            if budget is not None and budget.exhausted():
+                break
+            results = run_all([temps[temp_of[r]] for r in range(n_replicas)])
+            values = []
+            for r, (val, acc, rep_best, rep_sol, run_best) in enumerate(results):
+                k = temp_of[r]
+                accepted[k] += acc
+                # run_best: melhor valor desta rodada, toda feita na T de índice k
+                # (rep_best, o melhor da réplica em todas as T, só vale para f_best)
+                best_at[k] = max(best_at[k], run_best)
+                if rep_sol is not None and rep_best > f_best:
+                    f_best, best = rep_best, set(rep_sol)
+                values.append(val)
+
+            # trocas entre vizinhos (pares pares/ímpares alternados)
+            rep_at = [0] * n_replicas
+            for r, k in enumerate(temp_of):
+                rep_at[k] = r
+            for k in range(sweep % 2, n_replicas - 1, 2):
+                ri, rj = rep_at[k], rep_at[k + 1]
+                swaps_try[k] += 1
+                # energia = -valor: aceita com min(1, exp((1/Ti - 1/Tj) * (fj - fi)))
+                x = (1.0 / temps[k] - 1.0 / temps[k + 1]) * (values[rj] - values[ri])
+                if x >= 0 or rng.random() < math.exp(x):
+                    swaps_ok[k] += 1
+                    temp_of[ri], temp_of[rj] = k + 1, k
+            done += 1
+            if budget is not None:
+                budget.spend(n_replicas * steps_per_sweep)
+                budget.record(f_best)
+    finally:
+        if processes:
+            for conn in conns:
+                conn.send(None)
+            for p in procs:
+                p.join()
+
+    total_steps = done * steps_per_sweep
+    stats = [{"T": temps[k],
+              "acceptance": accepted[k] / total_steps if total_steps else 0.0,
+              "swap_rate": swaps_ok[k] / swaps_try[k] if swaps_try[k] else 0.0,
+              "best": best_at[k]}
+             for k in range(n_replicas)]
+    return f_best, best, stats
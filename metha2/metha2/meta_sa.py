@@ -1,55 +1,61 @@
 import math, random
-from utils import solution_value, solution_weight
-from local_search import deps_of_solution, delta_cost_swap
+from solution_state import make_state
 
+# stats (opcional, ver instrumentation.py): tempos, contadores e um registro por nível
 def sa_temperature_initial(m, b, c, a, pkg_deps, s_init,
                            SAmax=200, T0=1.0, gamma=0.95, beta=2.0,
-                           max_levels=50, max_neighbor_trials=5, fallback_T0=100.0, seed=None):
+                           max_levels=50, max_neighbor_trials=5, fallback_T0=100.0, seed=None,
+                           stats=None):
 
     rng = random.Random() if seed is None else random.Random(seed)
+    if stats is not None:
+        stats.start("sa_T0")
+
+    init_state = make_state(c, a, pkg_deps, s_init)
 
     T = T0
     level = 0
     while level < max_levels:
         accepted = 0
-        s = set(s_init)
-        f_s = solution_value(s, c)
+        infeasible = 0
+        s = init_state.copy()
 
         it = 0
         while it < SAmax:
             # tenta gerar um vizinho viável em poucas tentativas
             trials = 0
-            s2 = None
-            while trials < max_neighbor_trials and s2 is None:
+            p = None
+            while trials < max_neighbor_trials and p is None:
                 p = rng.randrange(m)
-                cand = set(s)
-                if p in cand:
-                    cand.remove(p)  # remover sempre viável
-                else:
-                    deps_now = deps_of_solution(cand, pkg_deps)
-                    add_cost = sum(a[d] for d in (pkg_deps[p] - deps_now))
-                    if solution_weight(cand, pkg_deps, a) + add_cost > b:
-                        trials += 1
-                        continue
-                    cand.add(p)
-                s2 = cand
-
-            if s2 is None:  # não conseguiu vizinho viável -> conta iteração e segue
+                if p not in s.selected and s.weight + s.delta_add(p) > b:
+                    # remover sempre viável; adicionar precisa caber
+                    p = None
+                    trials += 1
+                    infeasible += 1
+
+            if p is None:  # não conseguiu vizinho viável -> conta iteração e segue
                 it += 1
                 continue
 
-            f_s2 = solution_value(s2, c)
-            delta = f_s2 - f_s  # maximização
+            delta = -c[p] if p in s.selected else c[p]  # maximização
 
             # aceita (Metrópolis)
             if delta > 0 or rng.random() < math.exp(delta / T):
                 accepted += 1
-                s, f_s = s2, f_s2
+                s.flip(p)
 
             it += 1
 
+        if stats is not None:
+            stats.count("T0_evaluations", SAmax)
+            stats.count("T0_infeasible_trials", infeasible)
+            stats.level(phase="sa_T0", T=T, evaluations=SAmax, accepted=accepted,
+                        acceptance=accepted / SAmax, infeasible_trials=infeasible)
+
         # taxa de aceitação atingiu gamma? ótimo.
         if accepted >= gamma * SAmax:
+            if stats is not None:
+                stats.stop("sa_T0")
             return T
 
         # senão, aumenta T e tenta de novo
@@ -57,76 +63,128 @@ def sa_temperature_initial(m, b, c, a, pkg_deps, s_init,
         level += 1
 
     # se não alcançou gamma dentro do limite, usa fallback
+    if stats is not None:
+        stats.stop("sa_T0")
     return fallback_T0
 
+# ---------- vizinho (flip 60% / swap 40%), compartilhado com o parallel tempering ----------
+def sa_propose_move(m, b, state, rng, max_neighbor_trials, stats=None):
+    """
+    Tenta achar um vizinho viável em até max_neighbor_trials tentativas.
+    Devolve o movimento (p_out, p_in) ou None.
+    """
+    current = state.selected
+    trials = 0
+    while trials < max_neighbor_trials:
+        if rng.random() < 0.6 or not current:
+            # FLIP
+            p = rng.randrange(m)
+            if stats is not None:
+                stats.count("flip_evaluated")
+            if p in current:
+                return (p, None)
+            if state.weight + state.delta_add(p) > b:
+                trials += 1
+                if stats is not None:
+                    stats.count("flip_infeasible")
+                continue
+            return (None, p)
+        else:
+            # SWAP
+            # a ordem de tuple(current) vem do set do estado (alterado no lugar), não
+            # é a da versão que copiava o conjunto: a mesma semente pode sortear outro p_out
+            p_out = rng.choice(tuple(current))
+            p_in = rng.randrange(m)
+            if stats is not None:
+                stats.count("swap_evaluated")
+            if p_in in current:
+                trials += 1
+                if stats is not None:
+                    stats.count("swap_invalid")
+                continue
+            if state.weight + state.delta_swap(p_out, p_in) > b:
+                trials += 1
+                if stats is not None:
+                    stats.count("swap_infeasible")
+                continue
+            return (p_out, p_in)
+    return None
+
+def move_delta(c, move):
+    p_out, p_in = move
+    return (c[p_in] if p_in is not None else 0) - (c[p_out] if p_out is not None else 0)  # MAX
+
 # ---------- SA principal (maximização), com resfriamento geométrico ----------
+# budget (opcional, ver budget.py): cada vizinho sorteado conta como uma avaliação
+# cache (opcional, ver zobrist.py): registra as soluções aceitas (tag "sa") para medir
+# as revisitas pelos contadores do cache; valor e peso já são incrementais, então um
+# acerto não poupa nada e o resultado é o mesmo com ou sem cache
 def simulated_annealing(m, b, c, a, pkg_deps, initial_solution,
                         T0=None, alpha=0.97, SAmax=400, Tfinal=1e-3,
-                        max_neighbor_trials=10, seed=None):
+                        max_neighbor_trials=10, seed=None, budget=None, stats=None,
+                        cache=None):
 
     rng = random.Random() if seed is None else random.Random(seed)
 
     if T0 is None:
         T0 = sa_temperature_initial(m, b, c, a, pkg_deps, initial_solution,
                                     SAmax=min(200, SAmax), T0=1.0, gamma=0.95, beta=2.0,
-                                    max_levels=50, max_neighbor_trials=5, fallback_T0=100.0)
+                                    max_levels=50, max_neighbor_trials=5, fallback_T0=100.0,
+                                    stats=stats)
     T = T0
+    if stats is not None:
+        stats.start("sa")
 
-    current = set(initial_solution)
-    f_cur = solution_value(current, c)
-    best = set(current); f_best = f_cur
+    state = make_state(c, a, pkg_deps, initial_solution, cache.keys if cache is not None else None)
+    best = set(state.selected); f_best = state.value
+    if budget is not None:
+        budget.record(f_best)
 
-    while T > Tfinal:
+    out_of_budget = False
+    while T > Tfinal and not out_of_budget:
         it = 0
+        accepted = improving = no_move = 0
         while it < SAmax:
-            # tenta achar vizinho viável (flip 60% / swap 40%)
-            trials = 0
-            s2 = None
-            while trials < max_neighbor_trials and s2 is None:
-                if rng.random() < 0.6 or not current:
-                    # FLIP
-                    p = rng.randrange(m)
-                    cand = set(current)
-                    if p in cand:
-                        cand.remove(p)
-                    else:
-                        deps_now = deps_of_solution(cand, pkg_deps)
-                        add_cost = sum(a[d] for d in (pkg_deps[p] - deps_now))
-                        if solution_weight(cand, pkg_deps, a) + add_cost > b:
-                            trials += 1
-                            continue
-                        cand.add(p)
-                    s2 = cand
-                else:
-                    # SWAP
-                    p_out = rng.choice(tuple(current))
-                    p_in = rng.randrange(m)
-                    if p_in in current:
-                        trials += 1
-                        continue
-                    delta_w = delta_cost_swap(p_out, p_in, current, pkg_deps, a)
-                    if solution_weight(current, pkg_deps, a) + delta_w > b:
-                        trials += 1
-                        continue
-                    cand = set(current); cand.remove(p_out); cand.add(p_in)
-                    s2 = cand
+            if budget is not None and budget.spend():
+                out_of_budget = True
+                break
+            # tenta achar vizinho viável, movimento representado como (p_out, p_in)
+            move = sa_propose_move(m, b, state, rng, max_neighbor_trials, stats)
 
             # se não achou vizinho viável, só avança a iteração
-            if s2 is None:
+            if move is None:
+                no_move += 1
                 it += 1
                 continue
 
-            f_s2 = solution_value(s2, c)
-            delta = f_s2 - f_cur  # MAX
+            delta = move_delta(c, move)
 
             # aceita (Metrópolis)
             if delta > 0 or rng.random() < math.exp(delta / T):
-                current, f_cur = s2, f_s2
-                if f_cur > f_best:
-                    best, f_best = set(current), f_cur
+                state.apply(*move)
+                accepted += 1
+                if cache is not None and cache.get("sa", state.hash) is None:
+                    cache.put("sa", state.hash, (state.value, state.weight))
+                if delta > 0:
+                    improving += 1
+                if state.value > f_best:
+                    best, f_best = set(state.selected), state.value
+                    if budget is not None:
+                        budget.record(f_best)
 
             it += 1
 
+        if stats is not None:
+            stats.count("evaluations", it)
+            stats.count("accepted", accepted)
+            stats.count("improving", improving)
+            stats.count("no_feasible_neighbor", no_move)
+            stats.level(phase="sa", T=T, evaluations=it, accepted=accepted,
+                        acceptance=accepted / it if it else 0.0, improving=improving,
+                        no_feasible_neighbor=no_move, current=state.value, best=f_best)
+
         T *= alpha  # resfriamento geométrico
 
-    return f_best, best
\ No newline at end of file
+    if stats is not None:
+        stats.stop("sa")
+    return f_best, best
@@ -0,0 +1,149 @@
+import random
+from solution_state import make_state
+
+# ---------- Busca Tabu (maximização) ----------
+# A cada iteração aplica o melhor movimento admissível da vizinhança FLIP + SWAP,
+# mesmo que piore a solução. Pacotes que acabaram de entrar/sair ficam tabu por
+# algumas iterações (tenure, com um sorteio para não ciclar); um movimento tabu
+# só é aceito se levar a uma solução melhor que a melhor já vista (aspiração).
+# Avaliação incremental pelo SolutionState: O(|deps(p)|) por movimento, e o swap
+# usa candidatos em ordem decrescente de c (como swap_neighbourhood.py).
+
+
+def _best_tabu_move(m, b, state, by_value, tabu_until, it, f_best):
+    """
+    Melhor movimento admissível (p_out, p_in) e sua variação de valor, ou
+    (None, None). Devolve também quantos deltas exatos foram calculados e
+    quantos candidatos tabu foram descartados.
+    """
+    c, selected = state.c, state.selected
+    slack = b - state.weight
+    value = state.value
+    best_move, best_delta = None, None
+    evaluated = rejected = 0
+
+    def admissible(delta, *pkgs):
+        # tabu se algum pacote do movimento está tabu, exceto pela aspiração
+        if all(tabu_until[p] <= it for p in pkgs):
+            return True
+        return value + delta > f_best
+
+    # FLIP: remover (sempre viável)
+    for p in selected:
+        delta = -c[p]
+        if best_delta is not None and delta <= best_delta:
+            continue
+        if admissible(delta, p):
+            best_move, best_delta = (p, None), delta
+        else:
+            rejected += 1
+
+    # FLIP: adicionar; lower[p] = delta_add(p), também limite inferior do swap
+    ins = [p for p in by_value if p not in selected]
+    lower = {}
+    for p in ins:
+        delta = c[p]
+        if best_delta is not None and delta <= best_delta:
+            break   # ordem decrescente de c
+        evaluated += 1
+        lower[p] = state.delta_add(p)
+        if lower[p] > slack:
+            continue
+        if admissible(delta, p):
+            best_move, best_delta = (None, p), delta
+            break
+        rejected += 1
+
+    # SWAP: para cada p_out, o primeiro p_in viável e admissível em ordem de c
+    for p_out in selected:
+        base = -c[p_out]
+        freed = ctx = None
+        for p_in in ins:
+            delta = base + c[p_in]
+            if best_delta is not None and delta <= best_delta:
+                break
+            lb = lower.get(p_in)
+            if lb is None:
+                lb = lower[p_in] = state.delta_add(p_in)
+            if freed is None:
+                freed, ctx = state.swap_out(p_out)
+            if lb - freed > slack:
+                continue
+            evaluated += 1
+            if state.swap_in_cost(ctx, p_in) - freed > slack:
+                continue
+            if admissible(delta, p_out, p_in):
+                best_move, best_delta = (p_out, p_in), delta
+                break
+            rejected += 1
+
+    return best_move, best_delta, evaluated, rejected
+
+
+# budget (opcional, ver budget.py): os deltas calculados em cada iteração contam como avaliações
+# stats (opcional, ver instrumentation.py): tempo, iterações, movimentos, tabu e aspiração
+def tabu_search(m, b, c, a, pkg_deps, initial_solution,
+                max_iters=2000, tenure=None, max_no_improve=300, seed=None,
+                budget=None, stats=None):
+    """
+    Devolve (f_best, best). tenure=None usa max(7, m // 30); cada pacote movido
+    fica tabu por tenure + sorteio em [0, tenure // 2] iterações.
+    Se todos os movimentos viáveis estiverem tabu a lista é esvaziada.
+    Para em max_iters, após max_no_improve iterações sem melhorar a melhor
+    solução, sem movimento viável ou quando o budget acaba.
+    """
+    rng = random.Random() if seed is None else random.Random(seed)
+    if tenure is None:
+        tenure = max(7, m // 30)
+    if stats is not None:
+        stats.start("tabu")
+
+    state = make_state(c, a, pkg_deps, initial_solution)
+    by_value = sorted(range(m), key=lambda p: (-c[p], p))
+    tabu_until = [0] * m   # iteração até a qual o pacote está tabu
+    best = set(state.selected); f_best = state.value
+    if budget is not None:
+        budget.record(f_best)
+
+    it = 0
+    no_improve = 0
+    while it < max_iters and no_improve < max_no_improve:
+        it += 1
+        move, delta, evaluated, rejected = _best_tabu_move(m, b, state, by_value, tabu_until, it, f_best)
+        if move is None and rejected:
+            # todos os movimentos viáveis estão tabu: esvazia a lista e tenta de novo
+            tabu_until = [0] * m
+            move, delta, more, _ = _best_tabu_move(m, b, state, by_value, tabu_until, it, f_best)
+            evaluated += more
+            if stats is not None:
+                stats.count("tabu_reset")
+        if stats is not None:
+            stats.count("evaluations", evaluated)
+            stats.count("tabu_rejected", rejected)
+        if move is None:
+            break   # nenhum movimento viável
+
+        p_out, p_in = move
+        if stats is not None:
+            tabu_move = any(p is not None and tabu_until[p] > it for p in move)
+            stats.count("aspiration", tabu_move)
+            stats.count("swap_moves" if p_out is not None and p_in is not None else "flip_moves")
+        state.apply(p_out, p_in)
+        for p in move:
+            if p is not None:
+                tabu_until[p] = it + tenure + rng.randint(0, tenure // 2)
+
+        if state.value > f_best:
+            best, f_best = set(state.selected), state.value
+            no_improve = 0
+            if budget is not None:
+                budget.record(f_best)
+        else:
+            no_improve += 1
+        if budget is not None and budget.spend(evaluated + 1):
+            break
+
+    if stats is not None:
+        stats.count("tabu_iterations", it)
+        stats.stop("tabu")
+    return f_best, best
@@ -0,0 +1,106 @@
+import os
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+from bitset_deps import BitsetDeps
+from budget import Budget
+from constructive import constructive_grasp
+from constructive_batch import incidence_csr
+from local_search import local_search_first_improvement
+from zobrist import EvalCache
+
+# GRASP multi-start + busca local (first improvement) em vários processos.
+#  - a instância vai uma única vez para memória compartilhada (CSR + c + a);
+#    cada worker monta seus pkg_deps no initializer, nada é re-enviado por tarefa
+#  - a iteração i usa a semente derivada de (seed, i) via SeedSequence, então o
+#    resultado é o mesmo para qualquer número de workers
+#  - cache_size (opcional): cada worker guarda os ótimos locais já calculados
+#    (EvalCache, ver zobrist.py); uma construção repetida pula a busca local
+#  - budget (opcional, ver budget.py): cada tarefa conta as suas avaliações e o
+#    processo principal as lança no orçamento ao receber o resultado; o prazo e o
+#    alvo são conferidos entre tarefas (as que já estão nos workers terminam)
+
+_W = {}  # estado do worker: instância remontada a partir da memória compartilhada
+
+
+def iteration_seeds(seed, iters):
+    """Sementes independentes por iteração, derivadas da semente da execução."""
+    children = np.random.SeedSequence(seed).spawn(iters)
+    return [int(s.generate_state(1, dtype=np.uint64)[0]) for s in children]
+
+
+def _to_shared(arrays):
+    blocks, specs = [], []
+    for arr in arrays:
+        arr = np.ascontiguousarray(arr, dtype=np.int64)
+        shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+        np.ndarray(arr.shape, dtype=np.int64, buffer=shm.buf)[:] = arr
+        blocks.append(shm)
+        specs.append((shm.name, arr.shape))
+    return blocks, specs
+
+
+def _init_worker(specs, m, b, bitset, cache_size=None):
+    views = []
+    for name, shape in specs:
+        shm = shared_memory.SharedMemory(name=name)
+        views.append(np.ndarray(shape, dtype=np.int64, buffer=shm.buf))
+        _W.setdefault("shm", []).append(shm)  # mantém a referência viva
+    c, a, indptr, indices = (v.tolist() for v in views)
+    pkg_deps = [set(indices[indptr[p]:indptr[p + 1]]) for p in range(m)]
+    if bitset:
+        pkg_deps = BitsetDeps(pkg_deps, a)
+    _W.update(m=m, b=b, c=c, a=a, pkg_deps=pkg_deps,
+              cache=EvalCache(m, cache_size) if cache_size else None)
+
+
+def _grasp_ls_task(task):
+    i, it_seed, rcl_size = task
+    m, b, c, a, pkg_deps = _W["m"], _W["b"], _W["c"], _W["a"], _W["pkg_deps"]
+    counter = Budget()  # sem limites: só conta as avaliações da tarefa
+    _, pkgs = constructive_grasp(m, b, c, a, pkg_deps, iters=1, rcl_size=rcl_size, seed=it_seed,
+                                 budget=counter)
+    refined = local_search_first_improvement(m, b, c, a, pkg_deps, pkgs, budget=counter,
+                                             cache=_W["cache"])
+    return i, sum(c[p] for p in refined), sorted(refined), counter.evals
+
+
+def parallel_grasp_ls(m, b, c, a, pkg_deps, iters=200, rcl_size=8, seed=123, workers=None,
+                      cache_size=None, budget=None):
+    """
+    Roda iters iterações de (construção GRASP + busca local first improvement)
+    espalhadas em um pool de processos. Devolve (melhor valor, pacotes).
+    Empates são resolvidos pela menor iteração, para não depender da ordem
+    em que os workers terminam. Com budget os resultados são lidos em ordem de
+    iteração e a leitura para quando ele acaba: com max_evals o resultado
+    (iterações 0..i) também não depende do número de workers.
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = iteration_seeds(seed, iters)
+    tasks = [(i, seeds[i], rcl_size) for i in range(iters)]
+
+    indptr, indices = incidence_csr(pkg_deps)
+    blocks, specs = _to_shared([np.asarray(c), np.asarray(a), indptr, indices])
+    try:
+        with Pool(workers, initializer=_init_worker,
+                  initargs=(specs, m, b, isinstance(pkg_deps, BitsetDeps), cache_size)) as pool:
+            chunk = max(1, iters // (4 * workers))
+            best = (0, iters, [])  # (valor, iteração, pacotes)
+            if budget is not None:
+                results = pool.imap(_grasp_ls_task, tasks, chunksize=chunk)
+            else:
+                results = pool.imap_unordered(_grasp_ls_task, tasks, chunksize=chunk)
+            for i, val, pkgs, evals in results:
+                if (val, -i) > (best[0], -best[1]):
+                    best = (val, i, pkgs)
+                if budget is not None:
+                    budget.spend(evals)
+                    budget.record(best[0])
+                    if budget.exhausted():
+                        break   # sair do with encerra o pool (terminate)
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+    return best[0], set(best[2])
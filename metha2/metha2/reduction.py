@@ -0,0 +1,121 @@
+import sys
+from typing import Dict, List, Set
+
+from bitset_deps import BitsetDeps
+
+# Pré-processamento: reduz a instância antes dos solvers.
+#  1. pacotes com c <= 0 ou cujas deps sozinhas pesam mais que b: nunca entram
+#  2. deps de peso 0 não custam nada: saem das listas de deps
+#  3. pacotes sem deps (depois de 2): sempre entram (fixados, viram um offset de valor)
+#  4. pacotes com o mesmo conjunto de deps: viram um só, com a soma dos benefícios
+#     (com c > 0, numa solução ótima ou entram todos ou nenhum)
+#  5. deps que nenhum pacote restante exige: removidas
+#  6. deps exigidas exatamente pelos mesmos pacotes: viram uma só, com a soma dos
+#     pesos (sempre são cobertas juntas)
+# Pacote com deps contidas nas de outro NÃO pode ser descartado (na união de deps
+# ele sai de graça quando o outro entra); isso é tratado na volta: to_original
+# completa a solução com todo pacote original cujas deps já estão cobertas.
+#
+# uso: python reduction.py prob-software*.txt   (imprime as estatísticas)
+
+
+class Reduction:
+    """
+    Mapeamento entre a instância reduzida e a original:
+      - pkg_map[q]: pacotes originais representados pelo pacote reduzido q
+      - dep_map[e]: dependências originais representadas pela dependência reduzida e
+      - fixed: pacotes originais sempre selecionados
+      - offset: soma de c dos fixados (valor original = valor reduzido + offset)
+      - stats: contagens de cada regra
+    """
+
+    def __init__(self, c, a, pkg_deps, pkg_map, dep_map, fixed, stats):
+        self.c = c
+        self.a = a
+        self.pkg_deps = pkg_deps
+        self.pkg_map: List[List[int]] = pkg_map
+        self.dep_map: List[List[int]] = dep_map
+        self.fixed: List[int] = fixed
+        self.offset = sum(c[p] for p in fixed)
+        self.stats: Dict[str, int] = stats
+
+    def to_original(self, selected) -> Set[int]:
+        """Solução reduzida -> pacotes originais (com os fixados e os que saem de graça)."""
+        chosen = set(self.fixed)
+        for q in selected:
+            chosen.update(self.pkg_map[q])
+        covered = set()
+        for p in chosen:
+            covered |= self.pkg_deps[p]
+        # completa: pacote com c > 0 cujas deps já estão todas cobertas
+        for p, deps in enumerate(self.pkg_deps):
+            if p not in chosen and self.c[p] > 0 and deps <= covered:
+                chosen.add(p)
+        return chosen
+
+    def describe(self) -> str:
+        s = self.stats
+        return (f"pacotes {s['m']} -> {s['m_reduced']} (inviáveis {s['too_heavy']}, c<=0 {s['nonpositive']}, "
+                f"fixados {s['fixed']}, fundidos {s['merged']}); deps {s['n']} -> {s['n_reduced']} "
+                f"(peso 0 {s['zero_weight']}, sem uso {s['unused']}, fundidas {s['deps_merged']}); arestas {s['ne']} -> {s['ne_reduced']}")
+
+
+def reduce_instance(m, n, ne, b, c, a, pkg_deps):
+    """
+    Recebe a tupla de read_instance e devolve (instância reduzida, Reduction).
+    A instância reduzida tem o mesmo formato (m, n, ne, b, c, a, pkg_deps);
+    se pkg_deps era BitsetDeps, a reduzida também é.
+    """
+    stats = {"m": m, "n": n, "ne": ne, "too_heavy": 0, "nonpositive": 0,
+             "fixed": 0, "merged": 0, "zero_weight": sum(1 for w in a if w == 0), "unused": 0}
+    fixed = []
+    groups: Dict[frozenset, List[int]] = {}
+    for p in range(m):
+        deps = frozenset(d for d in pkg_deps[p] if a[d] > 0)
+        if c[p] <= 0:
+            stats["nonpositive"] += 1
+        elif sum(a[d] for d in deps) > b:
+            stats["too_heavy"] += 1
+        elif not deps:
+            fixed.append(p)
+            stats["fixed"] += 1
+        else:
+            groups.setdefault(deps, []).append(p)
+
+    used = sorted({d for deps in groups for d in deps})
+    stats["unused"] = sum(1 for d in range(n) if a[d] > 0) - len(used)
+
+    # deps com o mesmo conjunto de pacotes (colunas iguais) viram uma só
+    users: Dict[int, List[int]] = {d: [] for d in used}
+    for k, deps in enumerate(groups):
+        for d in deps:
+            users[d].append(k)
+    columns: Dict[tuple, List[int]] = {}
+    for d in used:
+        columns.setdefault(tuple(users[d]), []).append(d)
+    dep_map = list(columns.values())
+    stats["deps_merged"] = len(used) - len(dep_map)
+    new_dep = {d: e for e, ds in enumerate(dep_map) for d in ds}
+
+    pkg_map, red_c, red_deps = [], [], []
+    for deps, pkgs in groups.items():
+        stats["merged"] += len(pkgs) - 1
+        pkg_map.append(pkgs)
+        red_c.append(sum(c[p] for p in pkgs))
+        red_deps.append({new_dep[d] for d in deps})
+    red_a = [sum(a[d] for d in ds) for ds in dep_map]
+
+    m2, n2 = len(red_c), len(red_a)
+    ne2 = sum(len(deps) for deps in red_deps)
+    stats.update(m_reduced=m2, n_reduced=n2, ne_reduced=ne2)
+    if isinstance(pkg_deps, BitsetDeps):
+        red_deps = BitsetDeps(red_deps, red_a)
+    reduction = Reduction(c, a, list(pkg_deps), pkg_map, dep_map, fixed, stats)
+    return (m2, n2, ne2, b, red_c, red_a, red_deps), reduction
+
+
+if __name__ == "__main__":
+    from utils import read_instance
+    for path in sys.argv[1:]:
+        _, red = reduce_instance(*read_instance(path))
+        print(f"{path}: {red.describe()}")
@@ -0,0 +1,288 @@
+import json, math, os, sqlite3, sys
+
+from bounds import optimality_gap
+
+# Armazenamento estruturado dos resultados (SQLite, biblioteca padrão).
+#  - uma linha por execução, índice por (instância, método, semente)
+#  - soluções binárias guardadas compactadas em hex (bit p = pacote p escolhido)
+#  - leitura em streaming com filtro, resumo por instância x método via SQL
+#  - importadores para os arquivos antigos experimentos.txt / resultados.txt
+#
+# uso: python results_store.py import experimentos.txt resultados.txt
+#      python results_store.py summary
+
+DEFAULT_DB = "resultados.db"
+
+_COLUMNS = ["instance", "method", "seed", "run_id", "best_value", "total_weight",
+            "capacity", "num_pkgs", "time_seconds", "params", "packages_hex",
+            "deps_hex", "source", "trace", "stats", "upper_bound", "gap", "config"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    instance TEXT,
+    method TEXT NOT NULL,
+    seed INTEGER,
+    run_id INTEGER,
+    best_value INTEGER NOT NULL,
+    total_weight INTEGER,
+    capacity INTEGER,
+    num_pkgs INTEGER,
+    time_seconds REAL,
+    params TEXT,
+    packages_hex TEXT,
+    deps_hex TEXT,
+    source TEXT UNIQUE,
+    trace TEXT,
+    stats TEXT,
+    upper_bound INTEGER,
+    gap REAL,
+    config TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_cell ON results (instance, method, seed);
+"""
+
+
+def pack_bits(indices) -> str:
+    """Conjunto de índices -> hex (bit i ligado se i está no conjunto)."""
+    mask = 0
+    for i in indices:
+        mask |= 1 << i
+    return format(mask, "x")
+
+def unpack_bits(hex_str: str):
+    mask = int(hex_str, 16) if hex_str else 0
+    out = []
+    while mask:
+        low = mask & -mask
+        out.append(low.bit_length() - 1)
+        mask ^= low
+    return out
+
+def _binary_str_to_indices(s: str):
+    # "[0, 1, 0, ...]" -> [1, ...]
+    bits = s.strip().strip("[]").split(",")
+    return [i for i, v in enumerate(bits) if v.strip() == "1"]
+
+
+class ResultsStore:
+    def __init__(self, path: str = DEFAULT_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(_SCHEMA)
+        # bancos criados antes das colunas trace/stats/upper_bound/gap/config
+        cols = {r["name"] for r in self.conn.execute("PRAGMA table_info(results)")}
+        for col, kind in (("trace", "TEXT"), ("stats", "TEXT"), ("upper_bound", "INTEGER"), ("gap", "REAL"),
+                          ("config", "TEXT")):
+            if col not in cols:
+                self.conn.execute(f"ALTER TABLE results ADD COLUMN {col} {kind}")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- escrita ----------
+    def add(self, record: dict, commit: bool = True) -> bool:
+        """
+        record usa as chaves de _COLUMNS; "packages"/"deps" (listas de índices)
+        são aceitos no lugar de packages_hex/deps_hex, params pode ser dict,
+        trace (convergência, ver budget.py) pode ser lista e stats
+        (instrumentation.SolverStats.to_record) pode ser dict.
+        Registros com o mesmo "source" de um já gravado são ignorados;
+        devolve True se o registro entrou.
+        """
+        rec = dict(record)
+        if "packages" in rec:
+            rec["packages_hex"] = pack_bits(rec.pop("packages"))
+        if "deps" in rec:
+            rec["deps_hex"] = pack_bits(rec.pop("deps"))
+        if isinstance(rec.get("params"), dict):
+            rec["params"] = json.dumps(rec["params"], ensure_ascii=False)
+        if isinstance(rec.get("trace"), list):
+            rec["trace"] = json.dumps(rec["trace"])
+        if isinstance(rec.get("stats"), dict):
+            rec["stats"] = json.dumps(rec["stats"])
+        values = [rec.get(col) for col in _COLUMNS]
+        cur = self.conn.execute(
+            f"INSERT OR IGNORE INTO results ({', '.join(_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(_COLUMNS))})", values)
+        if commit:
+            self.conn.commit()
+        return cur.rowcount == 1
+
+    # ---------- leitura ----------
+    def iter(self, instance=None, method=None, seed=None):
+        """Percorre os registros (como dicts) filtrando por instância/método/semente."""
+        where, args = [], []
+        for col, val in (("instance", instance), ("method", method), ("seed", seed)):
+            if val is not None:
+                where.append(f"{col} = ?")
+                args.append(val)
+        sql = "SELECT * FROM results"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        for row in self.conn.execute(sql + " ORDER BY id", args):
+            rec = dict(row)
+            rec["params"] = json.loads(rec["params"]) if rec["params"] else {}
+            rec["trace"] = json.loads(rec["trace"]) if rec["trace"] else []
+            rec["stats"] = json.loads(rec["stats"]) if rec["stats"] else {}
+            rec["packages"] = unpack_bits(rec.pop("packages_hex"))
+            rec["deps"] = unpack_bits(rec.pop("deps_hex"))
+            yield rec
+
+    def done_keys(self):
+        """
+        Chaves (instância, método, semente, config) já gravadas; config é a
+        identificação da configuração da rodada (ver batch_runner.run_config),
+        None nos registros importados ou gravados sem ela.
+        """
+        return {tuple(r) for r in self.conn.execute(
+            "SELECT DISTINCT instance, method, seed, config FROM results")}
+
+    def summary(self):
+        """Melhor / média / desvio padrão do valor e tempo médio por instância x método."""
+        rows = self.conn.execute("""
+            SELECT instance, method, COUNT(*) AS n, MAX(best_value) AS best,
+                   AVG(best_value) AS mean, AVG(best_value * best_value) AS mean_sq,
+                   AVG(total_weight) AS mean_weight, AVG(time_seconds) AS mean_time
+            FROM results GROUP BY instance, method ORDER BY instance, method
+        """).fetchall()
+        out = []
+        for r in rows:
+            var = max(r["mean_sq"] - r["mean"] ** 2, 0.0)
+            std = math.sqrt(var * r["n"] / (r["n"] - 1)) if r["n"] > 1 else 0.0
+            out.append({"instance": r["instance"], "method": r["method"], "n": r["n"],
+                        "best": r["best"], "mean": r["mean"], "std": std,
+                        "mean_weight": r["mean_weight"], "mean_time": r["mean_time"]})
+        return out
+
+
+def record_from_solution(instance, method, seed, pkgs, pkg_deps, c, a, b, params, elapsed,
+                         upper_bound=None):
+    """
+    Monta o registro de uma execução a partir do conjunto de pacotes.
+    Com upper_bound (ver bounds.py) o registro leva também o gap.
+    """
+    deps = set()
+    for p in pkgs:
+        deps |= pkg_deps[p]
+    value = sum(c[p] for p in pkgs)
+    return {
+        "instance": os.path.basename(instance),
+        "method": method,
+        "seed": seed,
+        "best_value": value,
+        "total_weight": sum(a[d] for d in deps),
+        "capacity": b,
+        "num_pkgs": len(pkgs),
+        "time_seconds": elapsed,
+        "params": params,
+        "packages": pkgs,
+        "deps": deps,
+        "upper_bound": upper_bound,
+        "gap": optimality_gap(value, upper_bound),
+    }
+
+
+# ---------- importadores dos arquivos antigos ----------
+def import_experimentos_txt(store: ResultsStore, path: str = "experimentos.txt") -> int:
+    """
+    Importa os blocos gravados por utils.log_experiment_detail. Devolve quantos
+    registros entraram (blocos já importados antes não contam).
+    """
+    count = 0
+    block = {}
+    k = 0
+
+    def flush():
+        nonlocal count
+        if "method" not in block:
+            return
+        count += store.add({
+            "instance": os.path.basename(block.get("instance_path", "")),
+            "method": block["method"],
+            "seed": int(block["seed"]) if block.get("seed", "").isdigit() else None,
+            "best_value": int(block["best_value"]),
+            "total_weight": int(block["total_weight"]),
+            "time_seconds": float(block["time_seconds"]),
+            "params": block.get("params", "{}"),
+            "packages": _binary_str_to_indices(block.get("packages_binary", "")),
+            "deps": _binary_str_to_indices(block.get("dependencies_binary", "")),
+            "num_pkgs": len(_binary_str_to_indices(block.get("packages_binary", ""))),
+            "upper_bound": int(block["upper_bound"]) if "upper_bound" in block else None,
+            "gap": float(block["gap"]) if "gap" in block else None,
+            "source": f"{os.path.basename(path)}#{k}",
+        }, commit=False)
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line.startswith("===="):
+                flush()
+                block = {}
+                k += 1
+                continue
+            key, sep, val = line.partition(": ")
+            if sep:
+                block[key.strip()] = val.strip()
+    flush()
+    store.conn.commit()
+    return count
+
+
+def import_resultados_txt(store: ResultsStore, path: str = "resultados.txt", instance=None) -> int:
+    """
+    Importa as linhas de utils.log_execution: run_id;method;value;weight/capacity;num_pkgs;elapsed
+    (e ;upper_bound;gap no fim, quando gravadas com o limitante). O arquivo não
+    guarda a instância nem a semente; a instância pode ser informada. Devolve
+    quantos registros entraram (linhas já importadas antes não contam).
+    """
+    count = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for k, line in enumerate(f):
+            parts = line.strip().split(";")
+            if len(parts) not in (6, 8):
+                continue
+            run_id, method, value, wc, num_pkgs, elapsed = parts[:6]
+            ub, gap = (int(parts[6]), float(parts[7])) if len(parts) == 8 else (None, None)
+            weight, _, capacity = wc.partition("/")
+            count += store.add({
+                "instance": instance,
+                "method": method,
+                "run_id": int(run_id),
+                "best_value": int(value),
+                "total_weight": int(weight),
+                "capacity": int(capacity),
+                "num_pkgs": int(num_pkgs),
+                "time_seconds": float(elapsed),
+                "upper_bound": ub,
+                "gap": gap,
+                "source": f"{os.path.basename(path)}#{k}",
+            }, commit=False)
+    store.conn.commit()
+    return count
+
+
+def print_summary(store: ResultsStore):
+    print(f"| {'instance':<20} | {'método':<18} | {'n':>3} | {'best':>7} | {'média':>10} | {'desvio':>8} | {'tempo médio':>11} |")
+    for r in store.summary():
+        print(f"| {str(r['instance']):<20} | {r['method']:<18} | {r['n']:>3} | {r['best']:>7} | "
+              f"{r['mean']:>10.2f} | {r['std']:>8.2f} | {r['mean_time'] or 0:>11.4f} |")
+
+
+if __name__ == "__main__":
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "summary"
+    with ResultsStore(DEFAULT_DB) as store:
+        if cmd == "import":
+            for p in sys.argv[2:]:
+                if os.path.basename(p).startswith("experimentos"):
+                    print(p, import_experimentos_txt(store, p), "registros")
+                else:
+                    print(p, import_resultados_txt(store, p), "registros")
+        print_summary(store)
@@ -0,0 +1,214 @@
+from typing import Iterable, List, Set
+from bitset_deps import BitsetDeps, weighted_popcount
+
+
+class SolutionState:
+    """
+    Estado incremental de uma solução (conjunto de pacotes selecionados).
+    Mantém:
+      - selected: pacotes escolhidos
+      - dep_count[d]: quantos pacotes selecionados exigem a dependência d
+      - weight: soma de a[d] para toda d com dep_count[d] > 0
+      - value: soma de c[p] para p em selected
+      - hash: hash de Zobrist de selected (só se keys for dado, ver zobrist.py)
+    Assim cada movimento custa O(|deps(p)|) em vez de refazer a união
+    de dependências de toda a solução.
+    """
+
+    def __init__(self, c: List[int], a: List[int], pkg_deps: List[Set[int]],
+                 selected: Iterable[int] = (), keys: List[int] | None = None):
+        self.c = c
+        self.a = a
+        self.pkg_deps = pkg_deps
+        self.selected: Set[int] = set()
+        self.dep_count = [0] * len(a)
+        self.weight = 0
+        self.value = 0
+        self.keys = keys
+        self.hash = 0
+        for p in selected:
+            self.add(p)
+
+    # ---------- variações (não alteram o estado) ----------
+    def delta_add(self, p: int) -> int:
+        """Peso extra ao adicionar p (deps que ainda ninguém usa)."""
+        cnt, a = self.dep_count, self.a
+        return sum(a[d] for d in self.pkg_deps[p] if cnt[d] == 0)
+
+    def delta_remove(self, p: int) -> int:
+        """Variação de peso (<= 0) ao remover p (deps usadas só por p)."""
+        cnt, a = self.dep_count, self.a
+        return -sum(a[d] for d in self.pkg_deps[p] if cnt[d] == 1)
+
+    def delta_swap(self, p_out: int, p_in: int) -> int:
+        """Variação de peso ao trocar p_out (selecionado) por p_in (fora)."""
+        cnt, a = self.dep_count, self.a
+        deps_out = self.pkg_deps[p_out]
+        freed = sum(a[d] for d in deps_out if cnt[d] == 1)
+        # deps de p_in que ficam descobertas após remover p_out
+        add_cost = 0
+        for d in self.pkg_deps[p_in]:
+            k = cnt[d]
+            if k == 0 or (k == 1 and d in deps_out):
+                add_cost += a[d]
+        return add_cost - freed
+
+    # delta_swap em duas partes, para reaproveitar a parte de p_out em vários p_in:
+    # delta_swap(p_out, p_in) == swap_in_cost(ctx, p_in) - freed, (freed, ctx) = swap_out(p_out)
+    def swap_out(self, p_out: int):
+        """(peso liberado ao remover p_out, contexto para swap_in_cost)."""
+        cnt, a = self.dep_count, self.a
+        deps_out = self.pkg_deps[p_out]
+        return sum(a[d] for d in deps_out if cnt[d] == 1), deps_out
+
+    def swap_in_cost(self, ctx, p_in: int) -> int:
+        """Peso extra de p_in depois de remover o p_out de ctx."""
+        cnt, a = self.dep_count, self.a
+        add_cost = 0
+        for d in self.pkg_deps[p_in]:
+            k = cnt[d]
+            if k == 0 or (k == 1 and d in ctx):
+                add_cost += a[d]
+        return add_cost
+
+    # ---------- movimentos (alteram o estado) ----------
+    def add(self, p: int) -> None:
+        cnt, a = self.dep_count, self.a
+        for d in self.pkg_deps[p]:
+            if cnt[d] == 0:
+                self.weight += a[d]
+            cnt[d] += 1
+        self.selected.add(p)
+        self.value += self.c[p]
+        if self.keys is not None:
+            self.hash ^= self.keys[p]
+
+    def remove(self, p: int) -> None:
+        cnt, a = self.dep_count, self.a
+        for d in self.pkg_deps[p]:
+            cnt[d] -= 1
+            if cnt[d] == 0:
+                self.weight -= a[d]
+        self.selected.remove(p)
+        self.value -= self.c[p]
+        if self.keys is not None:
+            self.hash ^= self.keys[p]
+
+    def flip(self, p: int) -> None:
+        if p in self.selected:
+            self.remove(p)
+        else:
+            self.add(p)
+
+    def apply(self, p_out: int | None = None, p_in: int | None = None) -> None:
+        """
+        Aplica um movimento genérico: remove p_out e/ou adiciona p_in.
+        (flip de remoção -> só p_out, flip de adição -> só p_in, swap -> ambos)
+        """
+        if p_out is not None:
+            self.remove(p_out)
+        if p_in is not None:
+            self.add(p_in)
+
+    # ---------- auxiliares ----------
+    def chosen_deps(self) -> Set[int]:
+        return {d for d, k in enumerate(self.dep_count) if k > 0}
+
+    def copy(self) -> "SolutionState":
+        other = self.__class__.__new__(self.__class__)
+        other.c = self.c
+        other.a = self.a
+        other.pkg_deps = self.pkg_deps
+        other.selected = set(self.selected)
+        other.dep_count = self.dep_count[:]
+        other.weight = self.weight
+        other.value = self.value
+        other.keys = self.keys
+        other.hash = self.hash
+        return other
+
+
+class BitsetSolutionState(SolutionState):
+    """
+    Mesmo estado, para instâncias lidas com bitset=True (pkg_deps é BitsetDeps).
+    Além dos contadores, mantém os bitsets:
+      - covered: deps com dep_count > 0
+      - single:  deps com dep_count == 1 (as que são liberadas numa remoção)
+    e as variações viram operações de máscara + popcount ponderado.
+    """
+
+    def __init__(self, c: List[int], a: List[int], pkg_deps: BitsetDeps,
+                 selected: Iterable[int] = (), keys: List[int] | None = None):
+        self.masks = pkg_deps.masks
+        self.planes = pkg_deps.planes
+        self.covered = 0
+        self.single = 0
+        super().__init__(c, a, pkg_deps, selected, keys)
+
+    def delta_add(self, p: int) -> int:
+        return weighted_popcount(self.masks[p] & ~self.covered, self.planes)
+
+    def delta_remove(self, p: int) -> int:
+        return -weighted_popcount(self.masks[p] & self.single, self.planes)
+
+    def delta_swap(self, p_out: int, p_in: int) -> int:
+        out_only = self.masks[p_out] & self.single
+        uncovered = ~self.covered | out_only
+        return (weighted_popcount(self.masks[p_in] & uncovered, self.planes)
+                - weighted_popcount(out_only, self.planes))
+
+    def swap_out(self, p_out: int):
+        out_only = self.masks[p_out] & self.single
+        return weighted_popcount(out_only, self.planes), ~self.covered | out_only
+
+    def swap_in_cost(self, ctx, p_in: int) -> int:
+        return weighted_popcount(self.masks[p_in] & ctx, self.planes)
+
+    def add(self, p: int) -> None:
+        cnt = self.dep_count
+        for d in self.pkg_deps[p]:
+            k = cnt[d]
+            if k == 0:
+                self.single |= 1 << d
+            elif k == 1:
+                self.single &= ~(1 << d)
+            cnt[d] = k + 1
+        mask = self.masks[p]
+        self.weight += weighted_popcount(mask & ~self.covered, self.planes)
+        self.covered |= mask
+        self.selected.add(p)
+        self.value += self.c[p]
+        if self.keys is not None:
+            self.hash ^= self.keys[p]
+
+    def remove(self, p: int) -> None:
+        cnt = self.dep_count
+        freed = self.masks[p] & self.single
+        for d in self.pkg_deps[p]:
+            k = cnt[d] - 1
+            cnt[d] = k
+            if k == 1:
+                self.single |= 1 << d
+        self.weight -= weighted_popcount(freed, self.planes)
+        self.covered &= ~freed
+        self.single &= ~freed
+        self.selected.remove(p)
+        self.value -= self.c[p]
+        if self.keys is not None:
+            self.hash ^= self.keys[p]
+
+    def copy(self) -> "BitsetSolutionState":
+        other = super().copy()
+        other.masks = self.masks
+        other.planes = self.planes
+        other.covered = self.covered
+        other.single = self.single
+        return other
+
+
+def make_state(c: List[int], a: List[int], pkg_deps, selected: Iterable[int] = (),
+               keys: List[int] | None = None) -> SolutionState:
+    """Escolhe a representação do estado conforme o tipo de pkg_deps."""
+    if isinstance(pkg_deps, BitsetDeps):
+        return BitsetSolutionState(c, a, pkg_deps, selected, keys)
+    return SolutionState(c, a, pkg_deps, selected, keys)
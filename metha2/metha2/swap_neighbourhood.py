@@ -0,0 +1,131 @@
+from typing import Set
+
+
+class SwapNeighbourhood:
+    """
+    Vizinhança SWAP (tira p_out da solução, põe p_in) sobre um SolutionState,
+    sem enumerar cegamente os |S| x m pares:
+      - a parte de p_out (deps liberadas e seu peso) é calculada uma vez por
+        p_out e reaproveitada para todos os p_in (state.swap_out / swap_in_cost)
+      - candidatos a entrar: só valem p_in com c[p_in] > c[p_out] (+ a melhor
+        melhora já vista); no best improvement eles são percorridos em ordem
+        decrescente de c, então a varredura de cada p_out para no primeiro
+        viável ou quando o valor não pode mais melhorar
+      - filtro de viabilidade barato: delta_add(p_in) - liberado(p_out) é um
+        limite inferior de delta_swap, então se já estoura a folga o par é
+        descartado sem o cálculo exato
+      - don't-look bits (first improvement): p_out sem swap de melhora na
+        última varredura é pulado até um movimento mexer nas suas deps (ou
+        aumentar a folga). Antes de declarar ótimo local os p_out pulados são
+        conferidos de novo, então o resultado continua sendo ótimo local, mas
+        a trajetória pode mudar: um swap que libera deps de outros pacotes e
+        cobre deps de p_in pode dar a um p_out pulado um swap de melhora sem
+        mexer nas deps dele, e aí o primeiro swap achado é o de um p_out
+        seguinte (outro ótimo local). Nas prob-software.txt, 3, 4, 5 e 8, 200
+        partidas aleatórias deram os mesmos ótimos locais que sem os bits.
+    Contadores: evaluated (deltas exatos), pruned (cortados pelo limite
+    inferior), skipped (p_out pulados pelo don't-look).
+    """
+
+    def __init__(self, m: int, b: int, state):
+        self.m = m
+        self.b = b
+        self.state = state
+        c = state.c
+        self.by_value = sorted(range(m), key=lambda p: (-c[p], p))
+        self.dont_look: Set[int] = set()
+        self.evaluated = 0
+        self.pruned = 0
+        self.skipped = 0
+
+    def best_move(self, budget=None):
+        """
+        Melhor swap de melhora (p_out, p_in) ou None. Mesmo movimento da
+        varredura completa: maior valor, empate -> primeiro p_out e menor p_in.
+        """
+        state = self.state
+        c, selected = state.c, state.selected
+        slack = self.b - state.weight
+        ins = [p for p in self.by_value if p not in selected]
+        lower = {}
+        best_move = None
+        best_val = state.value
+        for p_out in list(selected):
+            base = state.value - c[p_out]
+            freed, ctx = state.swap_out(p_out)
+            for p_in in ins:
+                val = base + c[p_in]
+                if val <= best_val:
+                    break   # ordem decrescente de c: nenhum p_in adiante melhora
+                lb = lower.get(p_in)
+                if lb is None:
+                    lb = lower[p_in] = state.delta_add(p_in)
+                if lb - freed > slack:
+                    self.pruned += 1
+                    continue
+                self.evaluated += 1
+                feasible = state.swap_in_cost(ctx, p_in) - freed <= slack
+                if feasible:
+                    best_move, best_val = (p_out, p_in), val
+                if budget is not None and budget.spend():
+                    return best_move
+                if feasible:
+                    break   # primeiro viável é o melhor para este p_out
+        return best_move
+
+    def first_move(self, budget=None):
+        """
+        Primeiro swap de melhora (p_out na ordem de selected, p_in em ordem
+        crescente de índice), pulando os p_out marcados como don't-look (por
+        isso nem sempre é o primeiro da varredura completa, ver a classe).
+        Devolve (p_out, p_in), None (ótimo local) ou "budget" se o orçamento
+        acabou no meio da varredura.
+        """
+        state = self.state
+        c, selected = state.c, state.selected
+        slack = self.b - state.weight
+        ins = [p for p in range(self.m) if p not in selected]
+        lower = {}
+        outs = list(selected)
+        skipped = [p for p in outs if p in self.dont_look]
+        active = [p for p in outs if p not in self.dont_look]
+        self.skipped += len(skipped)
+        # segunda passada: confere os pulados antes de declarar ótimo local
+        for group in (active, skipped):
+            for p_out in group:
+                cp = c[p_out]
+                freed, ctx = state.swap_out(p_out)
+                for p_in in ins:
+                    if c[p_in] <= cp:
+                        continue
+                    lb = lower.get(p_in)
+                    if lb is None:
+                        lb = lower[p_in] = state.delta_add(p_in)
+                    if lb - freed > slack:
+                        self.pruned += 1
+                        continue
+                    if budget is not None and budget.spend():
+                        return "budget"
+                    self.evaluated += 1
+                    if state.swap_in_cost(ctx, p_in) - freed <= slack:
+                        return p_out, p_in
+                self.dont_look.add(p_out)
+        return None
+
+    def moved(self, p_out, p_in, old_weight: int) -> None:
+        """
+        Avisa que o estado recebeu o movimento (p_out e/ou p_in podem ser None).
+        Acorda os pacotes que dividem deps com os pacotes movidos; se o peso
+        caiu (folga maior), acorda todos.
+        """
+        if not self.dont_look:
+            return
+        if self.state.weight < old_weight:
+            self.dont_look.clear()
+            return
+        deps = self.state.pkg_deps
+        touched = set()
+        for p in (p_out, p_in):
+            if p is not None:
+                touched |= deps[p]
+        self.dont_look = {q for q in self.dont_look if touched.isdisjoint(deps[q])}
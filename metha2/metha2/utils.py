@@ -1,26 +1,33 @@
 import random, time,json
 from typing import List, Set, Tuple
+from bitset_deps import BitsetDeps
+from instance_cache import load_instance_arrays
 
 #funcao para salvamento de metricas
-def log_execution(run_id: int, method: str, value: int, weight: int, num_pkgs: int, capacity: int, elapsed: float, filename="resultados.txt"):
+def log_execution(run_id: int, method: str, value: int, weight: int, num_pkgs: int, capacity: int, elapsed: float,
+                  filename="resultados.txt", upper_bound=None):
+    # com upper_bound (ver bounds.py) a linha ganha ;limitante;gap no fim
     with open(filename, "a", encoding="utf-8") as f:
-        f.write(f"{run_id};{method};{value};{weight}/{capacity};{num_pkgs};{elapsed:.4f}\n")
+        line = f"{run_id};{method};{value};{weight}/{capacity};{num_pkgs};{elapsed:.4f}"
+        if upper_bound is not None:
+            gap = (upper_bound - value) / upper_bound if upper_bound > 0 else 0.0
+            line += f";{upper_bound};{max(gap, 0.0):.6f}"
+        f.write(line + "\n")
 
-def read_instance(path: str):
-    with open(path, "r", encoding="utf-8") as f:
-        # 1 m, n, ne, b
-        m, n, ne, b = map(int, f.readline().split())
-        #2 beneficios c (m)
-        c = list(map(int, f.readline().split()))
-     #   assert len(c) == m, f"Esperava {m} benefícios, veio {len(c)}" #debug
-        # 3 tamanhos a (n)
-        a = list(map(int, f.readline().split()))
-       # assert len(a) == n, f"Esperava {n} tamanhos, veio {len(a)}" #debug
-        # 4 ne linhas pacote dependencia (0-based)
-        pkg_deps = [set() for _ in range(m)]
-        for _ in range(ne):
-            p, d = map(int, f.readline().split())
-            pkg_deps[p].add(d)
+def read_instance(path: str, bitset: bool = False, cache: bool = True):
+    # bitset=True devolve pkg_deps como BitsetDeps (máscaras + tabela de pesos),
+    # que os solvers detectam e usam com o estado em bitset
+    # cache=True usa o cache compilado em .instance_cache/ (ver instance_cache.py)
+    # 1 m, n, ne, b / 2 beneficios c (m) / 3 tamanhos a (n) / 4 ne linhas pacote dependencia (0-based)
+    # (para os arrays CSR direto, sem montar os sets: instance_cache.load_instance_arrays)
+    m, n, ne, b, c, a, indptr, indices = load_instance_arrays(path, use_cache=cache)
+    c = c.tolist()
+    a = a.tolist()
+    ptr = indptr.tolist()
+    deps = indices.tolist()
+    pkg_deps = [set(deps[ptr[p]:ptr[p + 1]]) for p in range(m)]
+    if bitset:
+        pkg_deps = BitsetDeps(pkg_deps, a, csr=(indptr, indices))
     return m, n, ne, b, c, a, pkg_deps
 
 def marginal_cost(pkg: int, chosen_deps: Set[int], pkg_deps: List[Set[int]], a: List[int]) -> int:
@@ -55,7 +62,7 @@ def binaries_from_solution(selected_pkgs, m, selected_deps, n):
     return pkgs_str, deps_str
 
 def log_experiment_detail(filename, instance_path, method_name, best_value, total_weight,
-                          pkgs_str, deps_str, params_dict, seed, elapsed_seconds):
+                          pkgs_str, deps_str, params_dict, seed, elapsed_seconds, upper_bound=None):
     """
     Salva um bloco de experimento contendo:
       - caminho da instância
@@ -66,6 +73,7 @@ def log_experiment_detail(filename, instance_path, method_name, best_value, tota
       - parâmetros usados
       - semente aleatória
       - tempo em segundos
+      - limitante superior e gap (se upper_bound for dado, ver bounds.py)
     """
     with open(filename, "a", encoding="utf-8") as f:
         f.write("========================================\n")
@@ -78,3 +86,7 @@ def log_experiment_detail(filename, instance_path, method_name, best_value, tota
         f.write("params: " + json.dumps(params_dict, ensure_ascii=False) + "\n")
         f.write(f"seed: {seed}\n")
         f.write(f"time_seconds: {elapsed_seconds:.6f}\n")
+        if upper_bound is not None:
+            gap = (upper_bound - best_value) / upper_bound if upper_bound > 0 else 0.0
+            f.write(f"upper_bound: {upper_bound}\n")
+            f.write(f"gap: {max(gap, 0.0):.6f}\n")
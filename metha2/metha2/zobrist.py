@@ -0,0 +1,86 @@
+import random
+from collections import OrderedDict
+from typing import List
+
+# Hash de Zobrist das soluções + cache de avaliações.
+#  - cada pacote p tem uma chave aleatória de 64 bits; o hash de uma solução é o
+#    XOR das chaves dos pacotes escolhidos, então adicionar/remover p é um XOR
+#    (o SolutionState mantém state.hash quando recebe keys, ver solution_state.py)
+#  - EvalCache: LRU limitado de hash -> entrada, com contadores de acerto.
+#    Colisões de 64 bits são ignoradas (probabilidade desprezível para os
+#    tamanhos de cache usados aqui).
+# As chaves usam uma semente fixa, então o hash de uma solução é o mesmo em
+# qualquer processo.
+
+ZOBRIST_SEED = 0x5EED
+
+
+def zobrist_keys(m: int, seed: int = ZOBRIST_SEED) -> List[int]:
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(m)]
+
+
+def solution_hash(selected, keys: List[int]) -> int:
+    h = 0
+    for p in selected:
+        h ^= keys[p]
+    return h
+
+
+class EvalCache:
+    """
+    Cache LRU limitado, indexado por (tag, hash): a tag separa o que cada
+    método guarda. "ls_first"/"ls_best": (valor, peso, ótimo local) a partir
+    da solução de partida com aquele hash (ver local_search.py), o único uso
+    em que um acerto poupa trabalho; "grasp" (constructive.py) e "sa"
+    (meta_sa.py): (valor, peso) das soluções construídas/visitadas, só para
+    medir repetições pelos contadores.
+    Contadores: hits, misses, evictions (também por tag em by_tag).
+    """
+
+    def __init__(self, m: int, capacity: int = 100_000, seed: int = ZOBRIST_SEED):
+        self.keys = zobrist_keys(m, seed)
+        self.capacity = capacity
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.by_tag = {}
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, tag: str, h: int):
+        """Entrada guardada para (tag, h) ou None; conta acerto/falha."""
+        counts = self.by_tag.setdefault(tag, [0, 0])
+        entry = self._data.get((tag, h))
+        if entry is None:
+            self.misses += 1
+            counts[1] += 1
+            return None
+        self._data.move_to_end((tag, h))
+        self.hits += 1
+        counts[0] += 1
+        return entry
+
+    def put(self, tag: str, h: int, entry) -> None:
+        self._data[(tag, h)] = entry
+        self._data.move_to_end((tag, h))
+        if len(self._data) > self.capacity:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_record(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "hit_rate": round(self.hit_rate(), 6),
+            "by_tag": {tag: {"hits": h, "misses": mi, "hit_rate": round(h / (h + mi), 6) if h + mi else 0.0}
+                       for tag, (h, mi) in self.by_tag.items()},
+        }
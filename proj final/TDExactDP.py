@@ -0,0 +1,127 @@
+# TDExactDP.py
+import sys
+from bisect import bisect_right
+from typing import List, Tuple
+
+from TDSolution import TDSolution
+from TDInstance import TDInstance
+
+# (budget, dano ótimo, assignments) de cada ponto da fronteira dano x budget
+FrontierPoint = Tuple[int, float, List[int]]
+
+
+def _dp_tables(instance: TDInstance, capacity: int):
+    """
+    DP da mochila de múltipla escolha até capacity.
+    Devolve (best, choices): best[w] = maior dano com custo <= w;
+    choices[i][w] = tipo escolhido na célula i com capacidade w (-1 = vazia).
+    """
+    costs = [t.cost for t in instance.tower_types]
+    table = instance.damage_table
+
+    best = [0.0] * (capacity + 1)
+    choices: List[List[int]] = []
+
+    for i in range(instance.num_buildable()):
+        new_best = best[:]
+        choice = [-1] * (capacity + 1)
+        for k, cost in enumerate(costs):
+            dmg = table[i][k]
+            if dmg <= 0 or cost > capacity:
+                continue  # torre sem tile no alcance nunca ajuda
+            for w in range(cost, capacity + 1):
+                value = best[w - cost] + dmg
+                if value > new_best[w]:
+                    new_best[w] = value
+                    choice[w] = k
+        choices.append(choice)
+        best = new_best
+    return best, choices
+
+
+def _reconstruct(instance: TDInstance, choices: List[List[int]], w: int) -> List[int]:
+    """Escolhas de cada célula para a capacidade w (de trás para frente)."""
+    assignments = [-1] * instance.num_buildable()
+    for i in range(instance.num_buildable() - 1, -1, -1):
+        k = choices[i][w]
+        if k != -1:
+            assignments[i] = k
+            w -= instance.tower_types[k].cost
+    return assignments
+
+
+def exact_dp_td(instance: TDInstance) -> TDSolution:
+    """
+    Solução ótima por programação dinâmica (mochila de múltipla escolha).
+
+    Com o modelo de dano de TDSolution.total_damage cada (célula, tipo) contribui
+    de forma independente (instance.damage_table), então:
+      - grupos: células construíveis
+      - escolhas por grupo: vazia (-1, custo 0, dano 0) ou um tipo de torre
+      - capacidade: instance.budget
+    best[w] = maior dano com custo <= w usando as células já vistas.
+    Tempo O(células * tipos * budget) (pseudo-polinomial), memória O(células * budget)
+    para reconstruir a escolha de cada célula.
+    """
+    budget = instance.budget
+    best, choices = _dp_tables(instance, budget)
+    solution = TDSolution(_reconstruct(instance, choices, budget))
+    print("\n===== DP EXATO (Tower Defense) =====")
+    print(f"Dano ótimo: {best[budget]:.2f}")
+    print(f"Custo da solução ótima: {solution.total_cost(instance)}/{budget}")
+    return solution
+
+
+class DamageFrontier(list):
+    """
+    Pontos de quebra (budget, dano ótimo, assignments) em ordem crescente de
+    budget, válidos para budgets de 0 a max_budget (o alcance da DP).
+    """
+
+    def __init__(self, points: List[FrontierPoint], max_budget: int):
+        super().__init__(points)
+        self.max_budget = max_budget
+
+
+def damage_budget_frontier(instance: TDInstance, max_budget: int | None = None) -> DamageFrontier:
+    """
+    Fronteira de Pareto dano x budget para todo budget de 0 a max_budget
+    (padrão: instance.budget) com uma única DP: best[w] já é o ótimo para o
+    budget w. Devolve só os pontos de quebra (onde o dano ótimo aumenta), em
+    ordem crescente de budget, cada um com as escolhas ótimas; entre dois pontos
+    o ótimo é o do ponto anterior (ver frontier_lookup). Para consultar budgets
+    acima de instance.budget (ex.: "+50 de budget"), passe max_budget maior.
+    """
+    if max_budget is None:
+        max_budget = instance.budget
+    if max_budget < 0:
+        raise ValueError(f"max_budget negativo: {max_budget}")
+    best, choices = _dp_tables(instance, max_budget)
+    points: List[FrontierPoint] = [(0, best[0], [-1] * instance.num_buildable())]
+    for w in range(1, max_budget + 1):
+        if best[w] > best[w - 1]:
+            points.append((w, best[w], _reconstruct(instance, choices, w)))
+    return DamageFrontier(points, max_budget)
+
+
+def frontier_lookup(frontier: DamageFrontier, budget: int) -> FrontierPoint:
+    """Ponto ótimo para um budget (o último ponto de quebra com budget <= budget)."""
+    if budget < 0:
+        raise ValueError("Budget negativo.")
+    if budget > frontier.max_budget:
+        raise ValueError(f"Budget {budget} acima do alcance da fronteira ({frontier.max_budget}); "
+                         f"recalcule com max_budget >= {budget}.")
+    k = bisect_right([point[0] for point in frontier], budget) - 1
+    return frontier[k]
+
+
+if __name__ == "__main__":
+    # uso: python TDExactDP.py <id do mapa> [budget máximo]
+    from MapLoader import load_instance_from_txt
+    from main import create_tower_types
+
+    instance = load_instance_from_txt(int(sys.argv[1]), create_tower_types())
+    max_budget = int(sys.argv[2]) if len(sys.argv) > 2 else instance.budget
+    for w, dmg, assignments in damage_budget_frontier(instance, max_budget):
+        towers = sum(1 for a in assignments if a != -1)
+        print(f"budget {w:>5}  dano {dmg:>9.2f}  torres {towers:>3}")
@@ -1,7 +1,7 @@
 # td_instance.py
 from typing import List, Tuple
 from TowerType import TowerType
-from utils import Coord
+from utils import Coord, distance
 
 class TDInstance:
     """
@@ -21,9 +21,24 @@ class TDInstance:
         self.path = path
         self.tower_types = tower_types
         self.budget = budget
+        # tabela pré-calculada (uma vez, na carga):
+        # damage_table[i][k] = dano da torre tipo k na célula i = tiles do path no alcance * dps
+        self.damage_table: List[List[float]] = self._build_damage_table()
+
+    def _build_damage_table(self) -> List[List[float]]:
+        table = []
+        for cell in self.buildable_cells:
+            dists = [distance(cell, tile) for tile in self.path]
+            table.append([sum(1 for d in dists if d <= tower.range) * tower.dps
+                          for tower in self.tower_types])
+        return table
 
     def num_buildable(self) -> int:
         return len(self.buildable_cells)
 
     def get_tower_type(self, tower_id: int) -> TowerType:
         return self.tower_types[tower_id]
+
+    def tower_damage(self, cell_index: int, tower_id: int) -> float:
+        """Dano de uma torre tipo tower_id na célula cell_index (consulta à tabela)."""
+        return self.damage_table[cell_index][tower_id]
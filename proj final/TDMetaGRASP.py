@@ -2,6 +2,8 @@
 import random
 from typing import Dict
 
+import numpy as np
+
 from TDSolution import TDSolution
 from TDInstance import TDInstance
 
@@ -22,53 +24,56 @@ def greedy_randomized_construction(
         candidatos, onde K = max(1, int(alpha * len(candidates))).
       - Escolhe um candidato aleatoriamente da RCL e adiciona.
       - Para quando não há mais candidato viável ou não encontra melhorias.
+
+    Como o dano é aditivo, o ganho de (célula, tipo) é a entrada da tabela
+    instance.damage_table e não muda durante a construção: a matriz de ganhos
+    é montada uma vez (NumPy) junto com a máscara de candidatos válidos, que
+    persiste entre os passos: a cada escolha a linha da célula ocupada é
+    zerada, e a coluna de um tipo só é zerada quando o budget restante cai
+    abaixo do custo dele.
+    A RCL sai de um argpartition; a ordem (ganho decrescente, empate pela
+    ordem célula/tipo) é a mesma da versão com lista ordenada.
     """
     num_cells = instance.num_buildable()
-    num_types = len(instance.tower_types)
+    costs = np.array([t.cost for t in instance.tower_types])
 
     # começa sem torres
-    current = TDSolution([-1] * num_cells)
-    current_value = current.total_damage(instance)
+    assignments = [-1] * num_cells
+    gains = np.array(instance.damage_table, dtype=float).reshape(num_cells, len(costs))
+    remaining = instance.budget
+    # candidatos: célula livre, tipo que cabe no budget e ganho > 0
+    too_expensive = costs > remaining
+    valid = (gains > 0) & ~too_expensive[None, :]
 
     no_improve = 0
 
     while True:
-        candidates = []  # (gain, cell_index, tower_type)
+        idx = np.flatnonzero(valid)   # índices planos (célula * tipos + tipo), crescentes
 
-        for i in range(num_cells):
-            if current.assignments[i] != -1:
-                # já tem torre aqui
-                continue
-
-            for t in range(num_types):
-                new_assign = current.assignments[:]
-                new_assign[i] = t
-                cand = TDSolution(new_assign)
-
-                if not cand.is_feasible(instance):
-                    continue
-
-                gain = cand.total_damage(instance) - current_value
-                if gain > 0:
-                    candidates.append((gain, i, t))
-
-        if not candidates:
+        if len(idx) == 0:
             break  # não há mais como melhorar pela construção
 
-        # ordena por ganho decrescente
-        candidates.sort(key=lambda x: x[0], reverse=True)
-
-        # monta RCL com top-K candidatos
-        k = max(1, int(alpha * len(candidates)))
-        rcl = candidates[:k]
+        # RCL com top-K candidatos
+        g = gains.ravel()[idx]
+        k = max(1, int(alpha * len(idx)))
+        if k < len(idx):
+            kth = g[np.argpartition(-g, k - 1)[k - 1]]
+            above = idx[g > kth]
+            ties = idx[g == kth][:k - len(above)]
+            idx = np.concatenate((above, ties))
+            g = gains.ravel()[idx]
+        rcl = idx[np.lexsort((idx, -g))]   # ganho decrescente, empate pelo índice
 
         # escolhe um candidato aleatório da RCL
-        gain, i_chosen, t_chosen = rnd.choice(rcl)
-
-        new_assign = current.assignments[:]
-        new_assign[i_chosen] = t_chosen
-        current = TDSolution(new_assign)
-        current_value += gain
+        i_chosen, t_chosen = divmod(int(rnd.choice(rcl)), len(costs))
+
+        assignments[i_chosen] = t_chosen
+        valid[i_chosen, :] = False
+        remaining -= int(costs[t_chosen])
+        newly = (costs > remaining) & ~too_expensive
+        if newly.any():
+            valid[:, newly] = False
+            too_expensive |= newly
         no_improve = 0
 
         # critério extra de parada (opcional)
@@ -77,7 +82,7 @@ def greedy_randomized_construction(
             if no_improve >= max_no_improve:
                 break
 
-    return current
+    return TDSolution(assignments)
 
 
 def local_search_first_improvement(
@@ -95,7 +100,8 @@ def local_search_first_improvement(
     num_cells = instance.num_buildable()
     num_types = len(instance.tower_types)
 
-    current = TDSolution(initial_solution.assignments[:])
+    # custo e dano em cache: cada vizinho é avaliado por delta_flip, sem cópia
+    current = TDSolution(initial_solution.assignments[:], instance)
     current_value = current.total_damage(instance)
 
     for _ in range(max_iters):
@@ -112,16 +118,13 @@ def local_search_first_improvement(
                 if t == old_type:
                     continue
 
-                new_assign = current.assignments[:]
-                new_assign[i] = t
-                cand = TDSolution(new_assign)
-
-                if not cand.is_feasible(instance):
+                d_cost, d_dmg = current.delta_flip(i, t)
+                if current.cost + d_cost > instance.budget:
                     continue
 
-                value = cand.total_damage(instance)
+                value = current.damage + d_dmg
                 if value > current_value:
-                    current = cand
+                    current.apply(("flip", i, t), (d_cost, d_dmg))
                     current_value = value
                     improved = True
                     break  # sai do loop de tipos
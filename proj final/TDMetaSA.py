@@ -4,43 +4,55 @@ import random
 from TDSolution import TDSolution
 
 
-def generate_neighbor_td(instance, solution, rnd, max_trials=8):
+def generate_move_td(instance, solution, rnd, max_trials=8):
     """
-    Gera um vizinho viável a partir de uma TDSolution.
-    - Representação: solution.assignments (lista com índices de torres ou -1)
+    Sorteia um movimento viável a partir de uma TDSolution com cache
+    (criada com a instância), sem copiar a solução.
     - Movimento: ou FLIP (trocar tipo de torre em uma célula) ou SWAP (trocar duas posições).
-    - Garante viabilidade (custo <= budget).
+    - Garante viabilidade (custo <= budget) pelo Δcusto.
+    Devolve (movimento, (Δcusto, Δdano)) ou None; movimento no formato de TDSolution.apply.
     """
     num_cells = instance.num_buildable()
     num_types = len(instance.tower_types)
 
     for _ in range(max_trials):
-        new_assignments = solution.assignments[:]  # cópia rasa da lista
-
         # Escolhe tipo de movimento
         if rnd.random() < 0.5:
             # FLIP: altera o tipo de torre em uma célula
             pos = rnd.randrange(num_cells)
-            old = new_assignments[pos]
+            old = solution.assignments[pos]
             candidates = [-1] + list(range(num_types))
             if old in candidates:
                 candidates.remove(old)
-            new_assignments[pos] = rnd.choice(candidates)
+            move = ("flip", pos, rnd.choice(candidates))
         else:
             # SWAP: troca duas posições da lista
             if num_cells < 2:
                 continue
             i, j = rnd.sample(range(num_cells), 2)
-            new_assignments[i], new_assignments[j] = new_assignments[j], new_assignments[i]
+            move = ("swap", i, j)
 
-        candidate = TDSolution(new_assignments)
-        if candidate.is_feasible(instance):
-            return candidate
+        delta = solution.delta(move)
+        if solution.cost + delta[0] <= instance.budget:
+            return move, delta
 
-    # Se não achou vizinho viável em max_trials tentativas, retorna None
+    # Se não achou movimento viável em max_trials tentativas, retorna None
     return None
 
 
+def generate_neighbor_td(instance, solution, rnd, max_trials=8):
+    """
+    Gera um vizinho viável (nova TDSolution) a partir de uma TDSolution.
+    Mesmo sorteio de generate_move_td; devolve None se não achou vizinho viável.
+    """
+    current = TDSolution(solution.assignments[:], instance)
+    found = generate_move_td(instance, current, rnd, max_trials)
+    if found is None:
+        return None
+    current.apply(*found)
+    return current
+
+
 def simulated_annealing_td(instance, initial_solution, params, seed=None):
     """
     Simulated Annealing para o problema de Tower Defense.
@@ -58,8 +70,8 @@ def simulated_annealing_td(instance, initial_solution, params, seed=None):
     Tfinal = params.get("Tfinal", 1e-3)
     max_neighbor_trials = params.get("max_neighbor_trials", 8)
 
-    # Clona solução inicial
-    current = TDSolution(initial_solution.assignments[:])
+    # Clona solução inicial (com custo e dano em cache, atualizados a cada movimento)
+    current = TDSolution(initial_solution.assignments[:], instance)
     current_value = current.total_damage(instance)
 
     best = TDSolution(current.assignments[:])
@@ -81,14 +93,15 @@ def simulated_annealing_td(instance, initial_solution, params, seed=None):
         print(f"\n-- Temperatura {iter_global}: T = {T:.6f}")
 
         for it in range(SAmax):
-            neighbor = generate_neighbor_td(
+            found = generate_move_td(
                 instance, current, rnd, max_trials=max_neighbor_trials
             )
-            if neighbor is None:
+            if found is None:
                 # Não conseguiu vizinho viável nesta temperatura
                 break
 
-            neighbor_value = neighbor.total_damage(instance)
+            move, move_delta = found
+            neighbor_value = current.damage + move_delta[1]
             delta = neighbor_value - current_value  # maximização
 
             if delta >= 0:
@@ -101,7 +114,7 @@ def simulated_annealing_td(instance, initial_solution, params, seed=None):
                 accept = (x < prob)
 
             if accept:
-                current = neighbor
+                current.apply(move, move_delta)
                 current_value = neighbor_value
                 accepted += 1
 
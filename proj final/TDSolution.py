@@ -1,6 +1,5 @@
 # td_solution.py
-from typing import List
-from utils import distance
+from typing import List, Tuple
 from TDInstance import TDInstance
 
 
@@ -9,10 +8,22 @@ class TDSolution:
     Representa uma solução para o problema.
     assignments[i] = -1  -> célula vazia
     assignments[i] = k   -> torre do tipo k naquela célula
+
+    Se criada com a instância (TDSolution(assignments, instance)), guarda
+    custo e dano em cache (cost, damage) e oferece avaliação incremental:
+      - delta_flip(pos, new_type) / delta_swap(i, j): (Δcusto, Δdano) em O(1)
+      - apply(move): aplica o movimento no lugar, atualizando o cache
+    Movimentos: ("flip", pos, new_type) ou ("swap", i, j).
     """
 
-    def __init__(self, assignments: List[int]):
+    def __init__(self, assignments: List[int], instance: TDInstance | None = None):
         self.assignments = assignments
+        self.instance = instance
+        self.cost = 0
+        self.damage = 0.0
+        if instance is not None:
+            self.cost = self.total_cost(instance)
+            self.damage = self._raw_damage(instance)
 
     def total_cost(self, instance: TDInstance) -> int:
         total = 0
@@ -33,23 +44,65 @@ class TDSolution:
         if not self.is_feasible(instance):
             return -1e9  # penalização forte
 
+        return self._raw_damage(instance)
+
+    def _raw_damage(self, instance: TDInstance) -> float:
+        # soma das entradas da tabela pré-calculada (ver TDInstance.damage_table)
+        table = instance.damage_table
         dmg = 0.0
         for idx, tower_id in enumerate(self.assignments):
             if tower_id == -1:
                 continue
+            dmg += table[idx][tower_id]
 
-            tower = instance.get_tower_type(tower_id)
-            tower_pos = instance.buildable_cells[idx]
+        return dmg
 
-            for tile in instance.path:
-                if distance(tower_pos, tile) <= tower.range:
-                    dmg += tower.dps  # 1 segundo por tile
+    # ---------- avaliação incremental (precisa da instância no construtor) ----------
+    def _cell(self, pos: int, tower_id: int) -> Tuple[int, float]:
+        """(custo, dano) da torre tower_id na célula pos; (0, 0) se vazia."""
+        if tower_id == -1:
+            return 0, 0.0
+        return self.instance.tower_types[tower_id].cost, self.instance.damage_table[pos][tower_id]
 
-        return dmg
+    def delta_flip(self, pos: int, new_type: int) -> Tuple[int, float]:
+        """(Δcusto, Δdano) ao trocar o conteúdo da célula pos por new_type."""
+        old_cost, old_dmg = self._cell(pos, self.assignments[pos])
+        new_cost, new_dmg = self._cell(pos, new_type)
+        return new_cost - old_cost, new_dmg - old_dmg
+
+    def delta_swap(self, i: int, j: int) -> Tuple[int, float]:
+        """(Δcusto, Δdano) ao trocar o conteúdo das células i e j (o custo não muda)."""
+        ti, tj = self.assignments[i], self.assignments[j]
+        if ti == tj:
+            return 0, 0.0
+        table = self.instance.damage_table
+        dmg = 0.0
+        if ti != -1:
+            dmg += table[j][ti] - table[i][ti]
+        if tj != -1:
+            dmg += table[i][tj] - table[j][tj]
+        return 0, dmg
+
+    def delta(self, move) -> Tuple[int, float]:
+        kind, i, x = move
+        return self.delta_flip(i, x) if kind == "flip" else self.delta_swap(i, x)
+
+    def apply(self, move, delta: Tuple[int, float] | None = None) -> None:
+        """Aplica o movimento no lugar (delta já calculado pode ser reaproveitado)."""
+        d_cost, d_dmg = self.delta(move) if delta is None else delta
+        kind, i, x = move
+        if kind == "flip":
+            self.assignments[i] = x
+        else:
+            self.assignments[i], self.assignments[x] = self.assignments[x], self.assignments[i]
+        self.cost += d_cost
+        self.damage += d_dmg
 
     def __repr__(self):
         return f"TDSolution(assignments={self.assignments})"
 
     def copy(self):
         """Retorna uma cópia independente da solução atual."""
-        return TDSolution(self.assignments.copy())
+        sol = TDSolution(self.assignments.copy())
+        sol.instance, sol.cost, sol.damage = self.instance, self.cost, self.damage
+        return sol
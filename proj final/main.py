@@ -8,6 +8,7 @@ from MapLoader import build_instance_from_ascii, load_instance_from_txt
 from visualize import show_instance_grid, show_solution_grid
 from TDMetaSA import simulated_annealing_td
 from TDMetaGRASP import grasp_td
+from TDExactDP import exact_dp_td
 from utils import log_td_result
 
 RESULTS_FILE = "resultados_td.txt"
@@ -174,5 +175,39 @@ def main():
         title=f"Mapa com Torres (GRASP+LS) - Instância {instance_id}"
     )
 
+    # =================== ÓTIMO EXATO (DP, mochila de múltipla escolha) ===================
+    print("\n=== Rodando DP exato ===")
+    t0 = time.perf_counter()
+    best_dp = exact_dp_td(instance)
+    dp_time = time.perf_counter() - t0
+
+    dp_damage = best_dp.total_damage(instance)
+    dp_cost = best_dp.total_cost(instance)
+    dp_towers = sum(1 for a in best_dp.assignments if a != -1)
+
+    print("\n=== Resultado DP exato ===")
+    print(f"Dano ótimo (DP):   {dp_damage:.2f}")
+    print(f"Custo (DP):        {dp_cost}/{instance.budget}")
+    print(f"Nº de torres (DP): {dp_towers}")
+    print(f"Tempo (DP):        {dp_time:.4f} s")
+    # gap relativo das metaheurísticas em relação ao ótimo
+    for name, dmg in (("SA", sa_damage), ("GRASP+LS", grasp_damage)):
+        gap = (dp_damage - dmg) / dp_damage if dp_damage > 0 else 0.0
+        print(f"Gap {name}: {100 * gap:.2f}%")
+
+    log_td_result(
+        RESULTS_FILE,
+        instance_label=instance_label,
+        method="DP_EXATO",
+        seed=seed,
+        damage=dp_damage,
+        cost=dp_cost,
+        budget=instance.budget,
+        num_towers=dp_towers,
+        time_seconds=dp_time,
+        params={},
+        assignments=best_dp.assignments,
+    )
+
 if __name__ == "__main__":
     main()
\ No newline at end of file